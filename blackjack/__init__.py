@@ -24,22 +24,60 @@ For further informatino on the Classes defined in this package, see the document
 from .cards import(
     Card,
     Collection,
-    Deck)
+    Deck,
+    Shoe,
+    ReplayDeck,
+    ShuffleSource)
 
 from .players import(
     Hand,
     Player,
     HumanPlayer,
+    StrategyPlayer,
     Dealer)
 
 from .game import Game
 
+from .rules import Rules
+
+from .counting import(
+    Counter,
+    HiLo,
+    KO)
+
+from .results import(
+    PlayerResult,
+    RoundResult,
+    Tally)
+
+from .history import(
+    HistoryWriter,
+    HistoryReader,
+    ReplayPlayer)
+
+from .profiling import Profiler
+
 # Allows for `from blackjack import *` 
 __all__ = ['Card',
            'Collection',
            'Deck',
+           'Shoe',
+           'ReplayDeck',
+           'ShuffleSource',
            'Hand',
            'Player',
            'HumanPlayer',
+           'StrategyPlayer',
            'Dealer',
-           'Game']
+           'Game',
+           'Rules',
+           'Counter',
+           'HiLo',
+           'KO',
+           'PlayerResult',
+           'RoundResult',
+           'Tally',
+           'HistoryWriter',
+           'HistoryReader',
+           'ReplayPlayer',
+           'Profiler']
@@ -0,0 +1,253 @@
+"""This module plays many tables of blackjack at once in a single asyncio event loop.
+
+A Game calls each player's decision() and waits for the answer, so a player who is slow to decide
+(a human at the keyboard, or an agent on the other end of a network connection) holds up everything
+else the program is doing. An AsyncGame awaits its players instead. While one table waits for a
+decision, every other table keeps playing, so hundreds of tables can share one process. A table can
+also be given a time limit for each decision, so a player who never answers can't stall it forever.
+
+The following are included in this module:
+    AsyncGame : A game of blackjack that awaits its players' decisions and bets.
+    AsyncPlayer : The base class for players whose decision() and wager() are coroutines.
+    AsyncHumanPlayer : A human player that doesn't block the event loop while the human types.
+    play : A coroutine that plays rounds at many tables at once.
+    run : Plays rounds at many tables at once from synchronous code.
+"""
+
+import asyncio
+import inspect
+from time import perf_counter
+
+from .game import Game
+from .players import (
+    Player,
+    HumanPlayer)
+from .results import Tally
+from .rules import STAND
+
+
+class AsyncGame(Game):
+    """A game of blackjack that awaits its players' decisions and bets. Extends the Game class.
+
+    Players can be any mix of ordinary players (like StrategyPlayer) and players whose decision() and
+    wager() methods are coroutines (like AsyncPlayer). Ordinary players are asked exactly like they are
+    in a Game, and only the answers of asynchronous players are awaited.
+
+    Parameters
+    ----------
+        timeout : float or None
+            The number of seconds an asynchronous player has to make each decision or bet. A player who
+            takes longer stands (or bets their usual bet) and the game moves on. If None (the default),
+            players can take as long as they like.
+
+        All other parameters are the same as the Game class.
+
+    Data Attributes
+    ---------------
+        timeout : float or None
+            The time limit for each decision and bet.
+
+        timeouts : int
+            The number of decisions and bets that took longer than the time limit.
+
+        All other data attributes are the same as the Game class.
+
+    Methods
+    -------
+        simulate(n_rounds) :
+            A coroutine that plays n_rounds of blackjack without printing anything.
+            Returns a Tally of the outcomes.
+
+        All other methods are the same as the Game class.
+
+    Notes
+    -----
+        Playing a Round :
+            Calling an AsyncGame returns a coroutine, so rounds are played with await (or asyncio.run()).
+
+            Example:
+                game = AsyncGame(alice, bob, timeout=30)
+                result = await game() # plays one round and returns a RoundResult
+
+        Sharing the Event Loop :
+            A table only lets other tables play while it is waiting for an asynchronous player, and between
+            rounds in simulate(). Ordinary players decide straight away, so a table of them plays a round
+            without stopping, just as quickly as a Game.
+    """
+
+    def __init__(self, *players, summary=True, deck=None, rng=None, rules=None, history=None, profiler=None,
+                 timeout=None):
+        if timeout is not None and timeout <= 0:
+            raise ValueError('the timeout must be more than 0 seconds')
+
+        super().__init__(*players, summary=summary, deck=deck, rng=rng, rules=rules, history=history,
+                         profiler=profiler)
+        self.timeout = timeout
+        self.timeouts = 0
+
+    async def __call__(self):
+        """Plays one round of blackjack and returns a RoundResult describing how it went."""
+        return await self._round(self._summary)
+
+    async def _round(self, summary):
+        """Plays one round, printing what happens if summary is True. Shares every step with
+        Game.__call__() and only awaits the bets and decisions."""
+        actions = self._begin_round(summary)
+        await self._take_bets()
+        self._deal(summary)
+        self._mark('deal')
+        for player in self._players:
+            await self._turn_sequance(player, summary, actions)
+        self._mark('players')
+        self._reveal_hole_card()
+        await self._turn_sequance(self._dealer, summary)
+        self._mark('dealer')
+        return self._end_round(summary, actions)
+
+    async def _answer(self, answer):
+        """Returns answer, after awaiting it with the table's time limit if it is awaitable."""
+        if inspect.isawaitable(answer):
+            return await asyncio.wait_for(answer, self.timeout)
+        return answer
+
+    async def _take_bets(self):
+        """Seats every player, then awaits their bets for the round."""
+        for player in self._players:
+            self._seat(player)
+            player.hand.bet = await self._get_wager(player)
+
+    async def _get_wager(self, player):
+        """Returns the player's bet for the round, or their usual bet if they take too long."""
+        try:
+            wager = await self._answer(player.wager())
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            wager = player.bet
+        return self._check_wager(player, wager)
+
+    async def _get_decision(self, player):
+        """Returns the action the player chooses, or STAND if they take too long."""
+        try:
+            decision = await self._answer(player.decision())
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return STAND
+        return self._action(player, decision)
+
+    async def _timed_decision(self, player):
+        """Used in place of _get_decision() while the game has a profiler. The time includes waiting for
+        the player, so it is how long the table waited for the decision."""
+        start = perf_counter()
+        action = await AsyncGame._get_decision(self, player)
+        self._profiler.decision(player.name, perf_counter() - start)
+        return action
+
+    async def _play(self, steps, player):
+        """Runs steps like Game._play(), awaiting each decision. This makes _turn_sequance() and
+        _play_hand() return coroutines."""
+        action = None
+        while True:
+            try:
+                steps.send(action)
+            except StopIteration:
+                return
+            action = await self._get_decision(player)
+
+    async def simulate(self, n_rounds):
+        """Plays n_rounds of blackjack without printing anything and returns a Tally of the outcomes.
+
+        The table lets the other tables in the event loop play between its rounds, so a table of ordinary
+        players can't keep the rest waiting until it is done.
+        """
+
+        tally = Tally(player.name for player in self._players)
+        for _ in range(n_rounds):
+            tally.add(await self._round(False))
+            await asyncio.sleep(0)
+        return tally
+
+
+class AsyncPlayer(Player):
+    """The base class for players whose decision() and wager() methods are coroutines. Extends the
+    Player class.
+
+    An AsyncPlayer can only play at an AsyncGame. Override decision() (and wager(), to bet something
+    other than the usual bet) with coroutines that wait for an answer from anywhere: a network
+    connection, a queue, or another program.
+
+    Parameters
+    ----------
+        Same as the Player class.
+
+    Data Attributes
+    ---------------
+        Same as the Player class.
+
+    Methods
+    -------
+    decision() :
+        A coroutine. Returns the player's decision, the same as Player.decision().
+
+    wager() :
+        A coroutine. Returns the amount the player bets on the round (bet, unless overridden).
+
+    All other methods are the same as the Player class.
+    """
+
+    async def decision(self):
+        pass
+
+    async def wager(self):
+        return self.bet
+
+
+class AsyncHumanPlayer(HumanPlayer):
+    """A human player that doesn't hold up the other tables while the human types. Extends the
+    HumanPlayer class.
+
+    The human is asked for their decision in another thread, so the event loop keeps running while
+    they think. A human who runs out of time still has the question waiting in that thread, and the
+    next thing they type answers it, so a table with a human should usually have no timeout.
+
+    Parameters
+    ----------
+        Same as the HumanPlayer class.
+
+    Methods
+    -------
+    decision() :
+        A coroutine. Asks the human if they want to hit or stay, or take any other action the rules allow.
+
+    All other methods are the same as the HumanPlayer class.
+    """
+
+    async def decision(self):
+        return await asyncio.get_running_loop().run_in_executor(None, HumanPlayer.decision, self)
+
+
+async def play(tables, n_rounds):
+    """Plays n_rounds at every table at once and returns a list of their Tallies, in the order of tables.
+
+    Parameters
+    ----------
+        tables : iterable of AsyncGame
+            The tables to play at. Each table plays its rounds one after another, while the other tables
+            play theirs.
+
+        n_rounds : int
+            The number of rounds to play at each table.
+    """
+
+    tables = list(tables)
+    for table in tables:
+        if not isinstance(table, AsyncGame):
+            raise TypeError(f'can only play at an AsyncGame, not a {type(table).__name__}')
+    return list(await asyncio.gather(*(table.simulate(n_rounds) for table in tables)))
+
+
+def run(tables, n_rounds):
+    """Plays n_rounds at every table at once in a new event loop and returns a list of their Tallies.
+
+    This is play() for code that isn't already running in an event loop.
+    """
+    return asyncio.run(play(tables, n_rounds))
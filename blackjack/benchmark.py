@@ -0,0 +1,277 @@
+"""This module measures how fast the package's hot paths are.
+
+Every benchmark plays a fixed workload from a fixed seed, so two runs always do exactly the same
+work and only the time it takes changes. Each benchmark is run several times and the fastest run is
+kept, since slower runs are slowed down by other things happening on the computer. The garbage
+collector is turned off while a benchmark is timed, like the timeit module does.
+
+The module can be run as a script. It prints a table of the results, and can save them as JSON and
+compare them with results saved before a change:
+
+    python3 -m blackjack.benchmark --output before.json
+    # make a change
+    python3 -m blackjack.benchmark --compare before.json
+
+The following are included in this module:
+    BENCHMARKS : The name, unit, and description of every benchmark.
+    run : Runs the benchmarks and returns the results.
+    compare : Compares two sets of results.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .cards import (
+    Card,
+    Deck,
+    Shoe)
+from .game import Game
+from .players import (
+    Hand,
+    StrategyPlayer)
+
+SEED = 2024
+
+# name: (unit, True if a bigger number is better, description)
+BENCHMARKS = {
+    'rounds': ('hands/s', True, 'full rounds played by calling a Game, two players, one deck'),
+    'simulate': ('hands/s', True, 'rounds played by Game.simulate(), two players, six deck shoe'),
+    'draw_1_deck': ('draws/s', True, 'cards drawn from a one deck shoe, reshuffling at the cut card'),
+    'draw_6_decks': ('draws/s', True, 'cards drawn from a six deck shoe, reshuffling at the cut card'),
+    'draw_8_decks': ('draws/s', True, 'cards drawn from an eight deck shoe, reshuffling at the cut card'),
+    'hand_value': ('hands/s', True, 'hands of two to five cards built and valued'),
+    'deck_reset': ('resets/s', True, 'calls to Deck.reset()'),
+    'round_memory': ('bytes', False, 'the most memory a round allocates at once'),
+    'retained_blocks': ('blocks/round', False, 'memory blocks still allocated after a round, per round'),
+}
+
+
+def _timed(function, *args):
+    """Returns how long function(*args) takes, in seconds, with the garbage collector off."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        function(*args)
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _game(deck):
+    return Game(StrategyPlayer('A'), StrategyPlayer('B'), summary=False, deck=deck)
+
+
+def _rounds(scale):
+    n_rounds = int(20000 * scale)
+    game = _game(Deck(rng=SEED))
+    hands = []
+
+    def play():
+        for _ in range(n_rounds):
+            hands.append(len(game().players))
+
+    seconds = _timed(play)
+    return sum(hands), seconds
+
+
+def _simulate(scale):
+    n_rounds = int(50000 * scale)
+    game = _game(Shoe(rng=SEED))
+    tallies = []
+    seconds = _timed(lambda: tallies.append(game.simulate(n_rounds)))
+    return sum(sum(counts.values()) for counts in tallies[0].outcomes), seconds
+
+
+def _draw(decks):
+    def benchmark(scale):
+        n_draws = int(500000 * scale)
+        shoe = Shoe(decks, rng=SEED)
+
+        def draw():
+            draw_ = shoe.draw
+            for _ in range(n_draws):
+                if shoe.needs_shuffle:
+                    shoe.reshuffle()
+                draw_()
+
+        return n_draws, _timed(draw)
+    return benchmark
+
+
+def _hand_value(scale):
+    n_hands = int(200000 * scale)
+    rng = random.Random(SEED)
+    cards = [Card(value, 'Spades') for value in range(1, 14)]
+    hands = [rng.choices(cards, k=rng.randint(2, 5)) for _ in range(1000)]
+    hand = Hand()
+
+    def value():
+        for index in range(n_hands):
+            hand.add(hands[index % 1000])
+            hand.value
+            hand.discard()
+
+    return n_hands, _timed(value)
+
+
+def _deck_reset(scale):
+    n_resets = int(20000 * scale)
+    deck = Deck(rng=SEED)
+
+    def reset():
+        for _ in range(n_resets):
+            deck.reset()
+
+    return n_resets, _timed(reset)
+
+
+def _memory(scale):
+    """Returns the peak memory allocated by a round and the memory blocks retained per round."""
+    n_rounds = int(2000 * scale)
+    game = _game(Deck(rng=SEED))
+    for _ in range(100):  # cards and lookup tables are made the first time they are needed
+        game()
+
+    gc.collect()
+    before = sys.getallocatedblocks()
+    for _ in range(n_rounds):
+        game()
+    gc.collect()
+    # A block or two left over from the whole run is noise, not a leak, so the result is rounded.
+    retained = round(max(sys.getallocatedblocks() - before, 0) / n_rounds, 2)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for _ in range(n_rounds):
+            game()
+        peak = tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+_RATES = {
+    'rounds': _rounds,
+    'simulate': _simulate,
+    'draw_1_deck': _draw(1),
+    'draw_6_decks': _draw(6),
+    'draw_8_decks': _draw(8),
+    'hand_value': _hand_value,
+    'deck_reset': _deck_reset,
+}
+
+
+def run(names=None, repeat=5, scale=1.0):
+    """Runs the benchmarks and returns the results as a dict that can be saved as JSON.
+
+    Parameters
+    ----------
+        names : iterable of str or None
+            The benchmarks to run (see BENCHMARKS). If None (the default), every benchmark is run.
+
+        repeat : int
+            The number of times each benchmark is run. The fastest run is kept.
+
+        scale : float
+            Multiplies the size of every workload. Smaller is quicker but less stable.
+    """
+
+    names = list(BENCHMARKS) if names is None else list(names)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f'there is no benchmark called {name!r}')
+    if repeat < 1:
+        raise ValueError('each benchmark must run at least once')
+
+    results = {}
+    memory = None  # both memory benchmarks come from the same runs
+    for name in names:
+        unit, higher_is_better, _ = BENCHMARKS[name]
+        if name in _RATES:
+            runs = [_RATES[name](scale) for _ in range(repeat)]
+            operations, seconds = min(runs, key=lambda run_: run_[1])
+            value = operations / seconds
+        else:
+            if memory is None:
+                memory = [_memory(scale) for _ in range(repeat)]
+            value = min(run_[name == 'retained_blocks'] for run_ in memory)
+        results[name] = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'repeat': repeat,
+        'scale': scale,
+        'benchmarks': results,
+    }
+
+
+def compare(old, new):
+    """Returns a dict of how much better each benchmark in both old and new got, as a ratio.
+
+    A ratio above 1 means new is better (faster or smaller) and below 1 means it is worse.
+    """
+
+    ratios = {}
+    for name, result in new['benchmarks'].items():
+        before = old['benchmarks'].get(name)
+        if before is None:
+            continue
+        better, worse = (result['value'], before['value']) if result['higher_is_better'] else \
+            (before['value'], result['value'])
+        if worse:
+            ratios[name] = better / worse
+        else:
+            ratios[name] = 1.0 if better == worse else float('inf')
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures how fast the blackjack package is.')
+    parser.add_argument('names', nargs='*', help='the benchmarks to run (default: all of them)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of each benchmark; the best is kept (default 5)')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplies the size of each workload (default 1)')
+    parser.add_argument('--output', help='the file to save the results to as JSON')
+    parser.add_argument('--compare', help='a JSON file of earlier results to compare with')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (unit, _, description) in BENCHMARKS.items():
+            print(f'{name:<16} {unit:<13} {description}')
+        return
+
+    try:
+        results = run(args.names or None, args.repeat, args.scale)
+    except ValueError as error:
+        parser.error(str(error))
+    old = None
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        ratios = compare(old, results)
+
+    for name, result in results['benchmarks'].items():
+        line = f"{name:<16} {result['value']:>14,.1f} {result['unit']:<13}"
+        if old is not None and name in ratios:
+            line += f"{old['benchmarks'][name]['value']:>14,.1f}  x{ratios[name]:.3f}"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,19 @@ The following classes are included in this module:
     Card
     Collection
     Deck
+    Shoe
+    ReplayDeck
+    ShuffleSource
 """
 
+import copy
 import random
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:  # numpy is optional. ShuffleSource is just slower without it.
+    numpy = None
 
 
 class Card():
@@ -40,8 +50,15 @@ class Card():
         Methods
         -------
             flip() :
-                Changes the value of is_hidden. This is like flipping a card from facedown to faceup.
-                Returns None
+                Returns the same card turned over. This is like flipping a card from facedown to faceup.
+                Returns Card
+
+        Notes
+        -----
+            Cards can't be changed once they are made, so there only ever needs to be one of each card.
+            Card(4, 'Spades') always returns the same object, which is shared by every deck, shoe, and hand
+            that holds the 4 of Spades. Because of this, flip() doesn't change a card. It returns the facedown
+            (or faceup) version of the card, and collections keep track of which version they are holding.
 
         Other Behaviors
         ---------------
@@ -60,11 +77,34 @@ class Card():
                 str(Card(12, 'Hearts')) will return 'Queen of Hearts'
     """
 
-    def __init__(self, value: int, suit: str, is_hidden=False):
+    __slots__ = ('_value', '_suit', '_is_hidden', '_flipped')
+
+    _cards = {}  # every card ever made, so each card is only made once
 
-        self._value = value
-        self._suit = suit
-        self._is_hidden = is_hidden
+    def __new__(cls, value: int, suit: str, is_hidden=False):
+
+        key = (cls, value, suit, bool(is_hidden))
+        try:
+            return cls._cards[key]
+        except KeyError:
+            pass
+
+        # A card is made together with its turned over twin, so flip() doesn't have to look anything up.
+        faceup, facedown = super().__new__(cls), super().__new__(cls)
+        for card, hidden, twin in ((faceup, False, facedown), (facedown, True, faceup)):
+            object.__setattr__(card, '_value', value)
+            object.__setattr__(card, '_suit', suit)
+            object.__setattr__(card, '_is_hidden', hidden)
+            object.__setattr__(card, '_flipped', twin)
+            cls._cards[cls, value, suit, hidden] = card
+        return cls._cards[key]
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} objects cannot be changed')
+
+    def __reduce__(self):
+        # Unpickled cards go through __new__ so they are still shared.
+        return (type(self), (self._value, self._suit, self._is_hidden))
 
     @property  # use properties so these can't be changed from the outside.
     def value(self):
@@ -82,14 +122,14 @@ class Card():
         else:
             return None
 
-    @property  # The only way to change the is_hidden state of this card is to 'flip' it over
+    @property
     def is_hidden(self):
         """Returns True if the card is hidden, False if the card is not hidden."""
         return self._is_hidden
 
     def flip(self):
-        """Changes the value of is_hidden. Like flipping a card facedown to hid all the information."""
-        self._is_hidden = not self._is_hidden
+        """Returns this card turned over. Like flipping a card facedown to hid all the information."""
+        return self._flipped
 
     def __str__(self):
 
@@ -126,6 +166,11 @@ class Card():
         return self.value >= other.value
 
 
+def _card_order(card):
+    """The order cards are put in before a seeded deck is reshuffled."""
+    return card._suit, card._value, card._is_hidden
+
+
 class Collection():
     """An object for a collection of cards. This is the base class for Deck and Hand.
 
@@ -146,6 +191,22 @@ class Collection():
                 If True, cards are drawn with replacement.
                 When the draw method is called, a card is returned without removing the card from the collection.
 
+            rng : random.Random, int, or None
+                The random number generator used to shuffle and draw cards. If an int, a new random.Random
+                is seeded with it. If None (the default), the random module's shared generator is used.
+
+        Data Attributes
+        ---------------
+            ranks : tuple
+                The number of cards of each rank in the collection. ranks[rank] is the number of cards of
+                rank (1 to 13). ranks[0] is always 0. Facedown cards are included.
+
+            replacement : bool
+                True if cards are drawn with replacement. Can't be changed.
+
+            rng : random.Random or module
+                The random number generator used to shuffle and draw cards.
+
         Methods
         -------
             add(cards) :
@@ -157,6 +218,9 @@ class Collection():
                     cards : list or Card
                         The card or list of cards to be added to the collection.
 
+            chance(rank) :
+                Returns the chance that the next card drawn from the collection is of rank.
+
             draw() :
                 Returns single card from the collection.
 
@@ -167,12 +231,20 @@ class Collection():
                 Removes all cards from the collection.
                 Returns None
 
+            flip(index) :
+                Turns over the card at the given index.
+                Returns None
+
             hide() :
-                Sets the is_hidden attribute for each card in the collection to True.
+                Turns every card in the collection facedown, so is_hidden is True for each card.
                 Returns None
 
             reveal() :
-                Sets the is_hidden attribute for each card in the collection to False.
+                Turns every card in the collection faceup, so is_hidden is False for each card.
+                Returns None
+
+            seed(a) :
+                Seeds the collection's random number generator.
                 Returns None
 
             shuffle() :
@@ -202,14 +274,51 @@ class Collection():
             String :
                 Passing a collection into the str() method will return a string describing every card
                 in the collection.
+
+        Notes
+        -----
+            The number of cards of each rank is kept up to date as cards are added and drawn, so ranks
+            and chance() never have to look at the cards themselves.
     """
 
-    def __init__(self, cards=None, replacement=False):
+    def __init__(self, cards=None, replacement=False, rng=None):
+        if rng is None:
+            rng = random  # the module has the same methods as a random.Random object
+        elif not isinstance(rng, random.Random):
+            rng = random.Random(rng)
+        self._rng = rng
+
         self._cards = []
+        self._ranks = [0] * 14  # the number of cards of each rank, indexed by rank
         if cards is not None:
             self.add(cards)
         self._replacement = replacement
 
+    def __getstate__(self):
+        # Modules can't be pickled, so the random module's shared generator is stored as None.
+        state = self.__dict__.copy()
+        if state['_rng'] is random:
+            state['_rng'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._rng is None:
+            self._rng = random
+
+    @property
+    def replacement(self):
+        return self._replacement
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @property
+    def ranks(self):
+        """The number of cards of each rank, indexed by rank. ranks[0] is always 0."""
+        return tuple(self._ranks)
+
     def __iter__(self):  # Allows for interation over the collection of cards
         # Returns the interator object for the _cards list
         return iter(self._cards)
@@ -242,11 +351,18 @@ class Collection():
 
     def add(self, cards):
         """Adds a card object or a list of card objects to the collection"""
-        try:
-            for card in cards:
-                self._cards.append(card)
-        except TypeError:
-            self._cards.append(cards)
+        if isinstance(cards, Card):
+            cards = (cards,)
+        ranks = self._ranks
+        append = self._cards.append
+        for card in cards:
+            append(card)
+            ranks[card._value] += 1
+
+    def chance(self, rank):
+        """Returns the chance that the next card drawn from the collection is of rank."""
+        n_cards = len(self)
+        return self._ranks[rank] / n_cards if n_cards else 0.0
 
     def draw(self):
         """Retuns a card object from the collection.
@@ -255,31 +371,39 @@ class Collection():
         """
 
         if self._replacement:
-            return random.choice(self._cards)
+            return self._rng.choice(self._cards)
         else:
-            return self._cards.pop(0)
+            card = self._cards.pop(0)
+            self._ranks[card._value] -= 1
+            return card
 
     def discard(self):
         """Clears _cards back to an empty list"""
 
         self._cards.clear()
+        self._ranks = [0] * 14
+
+    def flip(self, index):
+        """Turns over the card at index. The collection holds the flipped card in its place."""
+        self._cards[index] = self._cards[index].flip()
 
     def hide(self):
         """flips all cards to a hidden state"""
-        for card in self:
-            if not card.is_hidden:
-                card.flip()
+        self._cards[:] = [card if card.is_hidden else card.flip() for card in self._cards]
 
     def reveal(self):
         """flips all cards to a not hidden state"""
-        for card in self:
-            if card.is_hidden:
-                card.flip()
+        self._cards[:] = [card.flip() if card.is_hidden else card for card in self._cards]
+
+    def seed(self, a=None):
+        """Seeds the random number generator used by the collection."""
+
+        self._rng.seed(a)
 
     def shuffle(self):
         """Randomizes the order of the collection of cards."""
 
-        random.shuffle(self._cards)
+        self._rng.shuffle(self._cards)
 
 
 class Deck(Collection):
@@ -302,6 +426,14 @@ class Deck(Collection):
                 If True, cards are drawn with replacement.
                 When the draw method is called, a card is returned without removing the card from the collection.
 
+            rng : random.Random, int, or None
+                The random number generator used to shuffle and draw cards. See the Collection class.
+                A ShuffleSource can be used to shuffle whole decks quickly.
+
+            counter : Counter or None
+                A card counting system (see the counting module) that sees every card drawn from the deck.
+                If None (the default), the deck isn't counted.
+
         Methods
         -------
             add(cards) :
@@ -319,26 +451,82 @@ class Deck(Collection):
                 If replacement is False, the card is removed from the deck.
                 If replacement is True, the card is NOT removed from the deck.
 
+            draw_many(n) :
+                Returns a list of the next n cards from the deck. This is the same as calling draw() n times,
+                but faster.
+
             discard() :
                 Removes all cards from the deck.
                 Returns None
 
+            drawn_cards(start=0) :
+                Returns a list of the cards drawn since the deck was last reshuffled, in the order they were
+                drawn, skipping the first start cards.
+
+            flip(index) :
+                Turns over the card at the given index.
+                Returns None
+
             hide() :
-                Sets the is_hidden attribute for each card in the deck to True.
+                Turns every card in the deck facedown, so is_hidden is True for each card.
                 Returns None
 
             reset() :
                 Removes all cards from the deck and replaces them with the 52 standard playing cards.
                 Returns None
 
+            reshuffle() :
+                Returns every card drawn from the deck back to the deck and shuffles all the cards.
+                Returns None
+
             reveal() :
-                Sets the is_hidden attribute for each card in the deck to False.
+                Turns every card in the deck faceup, so is_hidden is False for each card.
+                Returns None
+
+            seed(a) :
+                Seeds the deck's random number generator, collects every card drawn from the deck, and
+                reshuffles the deck starting from the same order every time, so every card drawn afterward
+                depends only on a.
                 Returns None
 
             shuffle() :
-                Randomizes the order of the cards in the deck.
+                Randomizes the order of the cards left in the deck. Cards already drawn stay drawn.
                 Returns None
 
+            start_round() :
+                Marks the start of a round. If the deck runs out of cards during the round, the cards drawn
+                before it are shuffled back into the deck and dealing carries on. A Game calls this
+                before every round.
+                Returns None
+
+        Data Attributes
+        ---------------
+            counter : Counter or None
+                The card counting system that sees every card drawn from the deck. Setting it attaches the
+                new counter to the deck and resets its count.
+
+            drawn : int
+                The number of cards drawn since the deck was last reshuffled. Always 0 if
+                cards are drawn with replacement.
+
+            needs_shuffle : bool
+                True if the deck should be reshuffled before the next round. A single deck is
+                reshuffled before every round, so this is always True for a Deck.
+
+        Notes
+        -----
+            Drawing from a deck is fast no matter how many cards the deck holds. The deck keeps every card
+            in a list and deals from a position in that list instead of removing cards from the front.
+            Cards that have been drawn are kept behind the position so reshuffle() only has to move the
+            position back to the start. Length, iteration, indexing, and ranks only see the cards left in the deck.
+
+            reshuffle() doesn't actually move any cards. Instead, each time a card is drawn it is picked at
+            random from the cards that haven't been drawn yet. This is exactly the same as shuffling first,
+            but it only costs one random number per card drawn rather than one per card in the deck. If
+            the cards left in the deck are looked at (by iterating, indexing, or printing the deck), the
+            rest of the shuffle is finished first so the cards are seen in the order they will be drawn.
+            If the deck's rng is a ShuffleSource, reshuffle() shuffles the whole deck at once instead.
+
         Other Behaviors
         ---------------
             Length :
@@ -364,14 +552,205 @@ class Deck(Collection):
                 in the deck.
     """
 
-    def __init__(self, cards=None, replacement=False):
+    def __init__(self, cards=None, replacement=False, rng=None, counter=None):
 
-        super().__init__(cards=cards, replacement=replacement)
+        self._position = 0  # the index in _cards of the next card to be drawn
+        self._shuffled = 0  # cards from _position up to this index are in their final order
+        self._round = 0  # the index in _cards of the first card drawn this round
+        self._all_ranks = [0] * 14  # like _ranks, but including the cards that have been drawn
+        self._counter = None
+        super().__init__(cards=cards, replacement=replacement, rng=rng)
         if self._cards == []:
             self._build()
+        self.counter = counter
 
-    def _build(self):
-        """Creats the 52 cards in a standard deck of playing cards.
+    @property
+    def counter(self):
+        return self._counter
+
+    @counter.setter
+    def counter(self, counter):
+        if self._counter is not None:
+            self._counter.deck = None
+        self._counter = counter
+        if counter is not None:
+            if counter.deck is not None:
+                counter.deck.counter = None
+            counter.deck = self
+            counter.reset()
+
+    @property
+    def drawn(self):
+        return self._position
+
+    @property
+    def needs_shuffle(self):
+        """A single deck is reshuffled before every round."""
+        return True
+
+    def drawn_cards(self, start=0):
+        """Returns a list of the cards drawn since the deck was last reshuffled, skipping the first start cards."""
+        return self._cards[start:self._position]
+
+    def __iter__(self):
+        self._finish_shuffle()
+        return islice(self._cards, self._position, None)
+
+    def __len__(self):
+        """Returns the number of cards left in the deck."""
+        return len(self._cards) - self._position
+
+    def __getitem__(self, index):
+        """Allows the cards left in the deck to be indexed."""
+        self._finish_shuffle()
+        if isinstance(index, slice):
+            return self._cards[self._position:][index]
+        return self._cards[self._index(index)]
+
+    def _index(self, index):
+        """Returns the index in _cards of the card at index among the cards left in the deck."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('deck index out of range')
+        return self._position + index
+
+    def draw(self):
+        """Retuns a card object from the deck.
+        if _replacement is False, returns the next card in the deck and moves past it
+        if _replacement is True, returns a random card from the deck without moving past it
+        """
+
+        if self._replacement:
+            card = self._rng.choice(self[:])
+            if self._counter is not None:
+                self._counter.see(card)
+            return card
+
+        cards = self._cards
+        position = self._position
+        if position >= self._shuffled:  # always true once the deck is empty
+            remaining = len(cards) - position
+            if remaining <= 0:
+                self._collect()
+                position = self._position
+                remaining = len(cards) - position
+
+            # One step of a Fisher-Yates shuffle: swap a random card from the rest of the deck into place.
+            index = position + int(self._rng.random() * remaining)
+            cards[position], cards[index] = cards[index], cards[position]
+            self._shuffled = position + 1
+
+        self._position = position + 1
+        card = cards[position]
+        self._ranks[card._value] -= 1
+        if self._counter is not None:
+            self._counter.see(card)
+        return card
+
+    def draw_many(self, n):
+        """Returns a list of the next n cards. The same as calling draw() n times, but faster."""
+
+        cards = self._cards
+        position = self._position
+        end = position + n
+        if self._replacement or end > len(cards):
+            return [self.draw() for _ in range(n)]
+
+        # The same steps of the Fisher-Yates shuffle as draw(), using the same random numbers.
+        size = len(cards)
+        random = self._rng.random
+        for index in range(max(position, self._shuffled), end):
+            swap = index + int(random() * (size - index))
+            cards[index], cards[swap] = cards[swap], cards[index]
+        if end > self._shuffled:
+            self._shuffled = end
+
+        self._position = end
+        drawn = cards[position:end]
+        ranks = self._ranks
+        for card in drawn:
+            ranks[card._value] -= 1
+        if self._counter is not None:
+            for card in drawn:
+                self._counter.see(card)
+        return drawn
+
+    def start_round(self):
+        """Marks the cards drawn so far as cards from earlier rounds. If the deck runs out before the round
+        is finished, those cards are shuffled back in (see _collect())."""
+        self._round = self._position
+
+    def _collect(self):
+        """Shuffles the cards drawn before the current round back into the deck so the round can be finished,
+        like a dealer reshuffling the discards. Raises an IndexError if there are none."""
+
+        start = self._round
+        if start == 0:
+            raise IndexError('draw from an empty deck')
+
+        # The cards of the current round move to the front, so they still count as drawn.
+        cards = self._cards
+        discards = cards[:start]
+        cards[:] = cards[start:] + discards
+        self._position = self._shuffled = len(cards) - start
+        self._round = 0
+        for card in discards:
+            self._ranks[card._value] += 1
+        if self._counter is not None:
+            for card in discards:
+                self._counter.unsee(card)
+
+    def add(self, cards):
+        """Adds a card object or a list of card objects to the bottom of the deck"""
+        self._finish_shuffle()
+        start = len(self._cards)
+        super().add(cards)
+        for card in self._cards[start:]:
+            self._all_ranks[card._value] += 1
+        self._shuffled = len(self._cards)
+
+    def flip(self, index):
+        """Turns over the card at index among the cards left in the deck."""
+        self._finish_shuffle()
+        super().flip(self._index(index))
+
+    def discard(self):
+        """Removes all cards from the deck, including cards that have already been drawn."""
+
+        self._cards.clear()
+        self._ranks = [0] * 14
+        self._all_ranks = [0] * 14
+        self._position = 0
+        self._shuffled = 0
+        self._round = 0
+        if self._counter is not None:
+            self._counter.reset()
+
+    def shuffle(self):
+        """Randomizes the order of the cards left in the deck.
+
+        Cards that have been drawn stay behind the position, so they still count as drawn and come back
+        at the next reshuffle().
+        """
+
+        rest = self._cards[self._position:]
+        self._rng.shuffle(rest)
+        self._cards[self._position:] = rest
+        self._shuffled = len(self._cards)
+
+    def _finish_shuffle(self):
+        """Shuffles any cards that reshuffle() left to be shuffled as they are drawn."""
+
+        start = max(self._position, self._shuffled)
+        if start < len(self._cards):
+            rest = self._cards[start:]
+            self._rng.shuffle(rest)
+            self._cards[start:] = rest
+        self._shuffled = len(self._cards)
+
+    def _build(self, decks=1):
+        """Creats the 52 cards in a standard deck of playing cards, decks times over.
 
         Note
         ----
@@ -379,12 +758,388 @@ class Deck(Collection):
             the discard() method in the parent class should be called
         """
 
-        for suit in ['Spades', 'Hearts', 'Diamonds', 'Clubs']:
-            for value in range(1, 14):
-                self.add(Card(value, suit))
+        # Every card is added with a single call to add(), so the deck's bookkeeping is only done once.
+        deck = [Card(value, suit) for suit in ('Spades', 'Hearts', 'Diamonds', 'Clubs') for value in range(1, 14)]
+        self.add(deck * decks)
+
+    def seed(self, a=None):
+        """Seeds the random number generator and reshuffles every card in the deck, drawn or not.
+
+        A shuffle rearranges the cards from whatever order they are in, so the cards are put back in
+        a standard order first. Otherwise the same seed would deal different cards depending on which
+        cards were dealt before it.
+        """
+
+        super().seed(a)
+        self._cards.sort(key=_card_order)
+        self.reshuffle()
 
     def reset(self):
         """Resets the deck to the original state: 52 standard playing cards."""
 
         self.discard()
         self._build()
+        if self._counter is not None:
+            self._counter.reset()
+
+    def reshuffle(self):
+        """Returns every card drawn from the deck back to the deck and shuffles the whole deck.
+
+        Unlike reset(), no cards are created. This is how a real dealer collects the cards after a round.
+        The shuffle itself happens as cards are drawn (see the notes in the class docstring).
+        The deck's counter, if it has one, starts counting again.
+        """
+
+        self._position = 0
+        self._round = 0
+        self._ranks = self._all_ranks.copy()
+        if isinstance(self._rng, ShuffleSource):
+            self._rng.shuffle(self._cards)
+            self._shuffled = len(self._cards)
+        else:
+            self._shuffled = 0
+        if self._counter is not None:
+            self._counter.reset()
+
+
+class Shoe(Deck):
+    """A dealing shoe holding several decks of standard playing cards. Extends the Deck Class.
+
+    A shoe is shuffled when it is built. Cards are then dealt round after round until the cut card
+    is reached, and only then is the shoe reshuffled - just like at a real blackjack table.
+
+        Parameters
+        ----------
+            decks : int
+                The number of standard 52 card decks in the shoe. The default is 6.
+
+            penetration : float
+                The fraction of the shoe dealt before the cut card is reached. Must be greater than 0
+                and no more than 1. The default is 0.75.
+
+            replacement : bool
+                Determines if cards are drawn from the shoe with replacement or without replacenemt.
+                See the Deck class.
+
+            rng : random.Random, int, or None
+                The random number generator used to shuffle and draw cards. See the Deck class.
+
+            counter : Counter or None
+                A card counting system that sees every card drawn from the shoe. See the Deck class.
+
+        Data Attributes
+        ---------------
+            cut_card : int
+                The number of cards dealt from the shoe before it needs to be reshuffled.
+
+            decks : int
+                The number of decks in the shoe.
+
+            needs_shuffle : bool
+                True if the cut card has been reached and the shoe should be reshuffled before the next round.
+
+            penetration : float
+                The fraction of the shoe dealt before the cut card is reached.
+
+        Methods
+        -------
+            reset() :
+                Removes all cards from the shoe, replaces them with new decks, and shuffles the shoe.
+                Returns None
+
+            All other methods are the same as the Deck class.
+
+        Other Behaviors
+        ---------------
+            Concatination :
+                Two shoes can be concatinated with the '+' operator. This returns a new Deck (not a Shoe)
+                holding the cards left in both shoes.
+
+        Notes
+        -----
+            The cut card is only checked between rounds, so a round can run past it. If the shoe runs
+            out of cards during a round, the cards drawn before the round are shuffled back in and the
+            round is finished with those (see Deck.start_round()). A counter stops counting the cards
+            that go back in. If no cards were drawn before the round, an IndexError is raised.
+    """
+
+    def __init__(self, decks=6, penetration=0.75, replacement=False, rng=None, counter=None):
+
+        if decks < 1:
+            raise ValueError('a shoe must hold at least one deck')
+        if not 0 < penetration <= 1:
+            raise ValueError('penetration must be greater than 0 and no more than 1')
+
+        self._decks = decks
+        self._penetration = penetration
+        super().__init__(replacement=replacement, rng=rng, counter=counter)
+        self.reshuffle()
+
+    @property
+    def decks(self):
+        return self._decks
+
+    @property
+    def penetration(self):
+        return self._penetration
+
+    @property
+    def cut_card(self):
+        """The number of cards dealt from the shoe before it needs to be reshuffled."""
+        return int(len(self._cards) * self._penetration)
+
+    @property
+    def needs_shuffle(self):
+        """True once the cut card has been reached."""
+        return self._position >= self.cut_card
+
+    def _build(self):
+        """Creates the cards for every deck in the shoe."""
+        super()._build(self._decks)
+
+    def __add__(self, other):
+        """Returns a Deck holding the cards left in both. A shoe can't be made from a list of cards, so
+        the result is a plain deck."""
+        if type(other) is not type(self):
+            return super().__add__(other)  # raises a TypeError
+        return Deck(cards=list(self) + list(other))
+
+    def reset(self):
+        """Resets the shoe with new decks and shuffles it."""
+
+        super().reset()
+        self.reshuffle()
+
+
+class ReplayDeck(Deck):
+    """A deck that deals recorded rounds again, card for card. Extends the Deck Class.
+
+    Each time the deck is reshuffled, it moves on to the next recorded round and deals that round's
+    cards in the order they were recorded. A game dealt from a replay deck plays the same rounds
+    again, so a player with a new strategy can be compared with the old one on exactly the same cards.
+
+        Parameters
+        ----------
+            rounds : iterable
+                The cards drawn in each round, in the order they were drawn. Each item is a list of cards
+                for one round, for example decode_cards(record.cards) for each round read by a HistoryReader.
+
+            decks : int
+                The number of standard 52 card decks the rounds were dealt from. The default is 1.
+
+            rng : random.Random, int, or None
+                The random number generator used to draw cards that weren't recorded. See the Deck class.
+
+            counter : Counter or None
+                A card counting system that sees every card drawn from the deck. See the Deck class.
+
+        Data Attributes
+        ---------------
+            decks : int
+                The number of decks the rounds were dealt from.
+
+            needs_shuffle : bool
+                Always True, since every round is a new recorded round.
+
+        Methods
+        -------
+            reshuffle() :
+                Moves on to the next recorded round. Raises an IndexError if every round has been dealt.
+                Returns None
+
+            seed(a) :
+                Seeds the random number generator used for the cards that weren't recorded. The deck isn't reshuffled.
+                Returns None
+
+            All other methods are the same as the Deck class.
+
+        Other Behaviors
+        ---------------
+            Concatination :
+                Two replay decks can be concatinated with the '+' operator. This returns a new Deck (not a
+                ReplayDeck) holding the cards left in both, including the cards that weren't recorded.
+
+        Notes
+        -----
+            A player with a new strategy might draw more cards than were recorded. Once the recorded
+            cards run out, the rest of the round's cards are drawn at random from the cards of the
+            decks that weren't recorded in that round. Length, ranks, and chance() count those cards
+            from the start of each round, so they are the same as for a freshly shuffled deck.
+
+            Every round starts from full decks, even if it was recorded from the middle of a shoe, so a
+            counter only sees the cards of the current round.
+    """
+
+    def __init__(self, rounds, decks=1, rng=None, counter=None):
+
+        if decks < 1:
+            raise ValueError('a replay deck must hold at least one deck')
+
+        self._decks = decks
+        self._rounds = iter(rounds)
+        self._unrecorded = 0  # the number of cards not yet added behind the recorded cards
+        super().__init__(rng=rng, counter=counter)
+        self._full = list(self._cards)
+
+    @property
+    def decks(self):
+        return self._decks
+
+    def __len__(self):
+        return len(self._cards) - self._position + self._unrecorded
+
+    def draw(self):
+        if self._unrecorded and self._position == len(self._cards):
+            self._add_unrecorded()
+        return super().draw()
+
+    def _add_unrecorded(self):
+        """Adds the cards that weren't recorded behind the recorded cards. They are shuffled as they are drawn."""
+
+        # Cards are only made once (see the Card class), so they can be matched by id.
+        recorded = {}
+        for card in self._cards:
+            recorded[id(card)] = recorded.get(id(card), 0) + 1
+        for card in self._full:
+            count = recorded.get(id(card))
+            if count:
+                recorded[id(card)] = count - 1
+            else:
+                self._cards.append(card)
+        self._unrecorded = 0
+
+    def _finish_shuffle(self):
+        if self._unrecorded:
+            self._add_unrecorded()
+        super()._finish_shuffle()
+
+    def shuffle(self):
+        if self._unrecorded:
+            self._add_unrecorded()
+        super().shuffle()
+
+    def _build(self):
+        """Creates the cards for every deck."""
+        super()._build(self._decks)
+
+    def __add__(self, other):
+        """Returns a Deck holding the cards left in both. A replay deck can't be made from a list of cards, so
+        the result is a plain deck."""
+        if type(other) is not type(self):
+            return super().__add__(other)  # raises a TypeError
+        return Deck(cards=list(self) + list(other))
+
+    def seed(self, a=None):
+        """Seeds the random number generator used for the cards that weren't recorded. Unlike Deck.seed(), the
+        deck isn't reshuffled, since that would skip a recorded round."""
+        self._rng.seed(a)
+
+    def reset(self):
+        """Removes all cards from the deck and replaces them with new decks. The recorded rounds aren't changed."""
+
+        self._unrecorded = 0
+        super().reset()
+        self._full = list(self._cards)
+
+    def reshuffle(self):
+        """Moves on to the next recorded round. Its cards are drawn in the order they were recorded."""
+
+        try:
+            cards = list(next(self._rounds))
+        except StopIteration:
+            raise IndexError('every recorded round has been dealt') from None
+        if len(cards) > len(self._full):
+            raise ValueError(f'a round of {len(cards)} cards can\'t be dealt from {self._decks} deck(s)')
+
+        self._cards = cards
+        self._position = 0
+        self._round = 0
+        self._shuffled = len(cards)
+        self._unrecorded = len(self._full) - len(cards)
+        self._ranks = self._all_ranks.copy()
+        if self._counter is not None:
+            self._counter.reset()
+
+
+class ShuffleSource(random.Random):
+    """A random number generator that makes shuffles in batches. Extends random.Random.
+
+    Shuffling a list with random.shuffle() takes a random number for every item in the list. A shuffle
+    source instead makes many shuffles (permutations) of the same length at once and hands them out
+    one at a time, so the cost of making them is shared by the whole batch. If NumPy is installed, a
+    batch of permutations is made with a single NumPy call, which is much faster than shuffling in
+    Python. Without NumPy, shuffles are made one at a time and are no faster than random.shuffle().
+
+    Passing a shuffle source as the rng of a Deck or Shoe makes reshuffle() shuffle the whole deck at
+    once using the next permutation, so drawing cards no longer needs any random numbers.
+
+        Parameters
+        ----------
+            seed : int or None
+                Seeds the generator. The same seed always gives the same shuffles.
+
+            batch_size : int
+                The number of permutations made at once for each length of list shuffled.
+
+        Methods
+        -------
+            permutation(n) :
+                Returns a random ordering of the numbers 0 to n - 1 as a list.
+
+            shuffle(x) :
+                Randomizes the order of the list x using the next permutation.
+                Returns None
+
+            All other methods are the same as random.Random.
+
+        Other Behaviors
+        ---------------
+            Pickling and copying :
+                A shuffle source can be pickled and copied. The copy makes the same shuffles as the
+                original from then on.
+    """
+
+    def __init__(self, seed=None, batch_size=256):
+        self._batch_size = batch_size
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        """Seeds the generator and throws away any permutations already made."""
+        super().seed(a, version)
+        self._permutations = {}
+        self._generator = None if numpy is None else numpy.random.default_rng(self.getrandbits(64))
+
+    def __reduce__(self):
+        # random.Random only keeps its own state, which would lose the batch size, the permutations already
+        # made, and NumPy's generator. They are copied so a copy of the source doesn't share them.
+        state = (self.getstate(), copy.deepcopy(self._permutations), copy.deepcopy(self._generator))
+        return type(self), (None, self._batch_size), state
+
+    def __setstate__(self, state):
+        random_state, self._permutations, self._generator = state
+        self.setstate(random_state)
+
+    def _batch(self, n):
+        """Makes a batch of permutations of length n."""
+        if numpy is not None:
+            orders = numpy.tile(numpy.arange(n), (self._batch_size, 1))
+            return self._generator.permuted(orders, axis=1).tolist()
+
+        batch = []
+        for _ in range(self._batch_size):
+            order = list(range(n))
+            super().shuffle(order)
+            batch.append(order)
+        return batch
+
+    def permutation(self, n):
+        """Returns a random ordering of the numbers 0 to n - 1."""
+        try:
+            return next(self._permutations[n])
+        except (KeyError, StopIteration):
+            self._permutations[n] = iter(self._batch(n))
+            return next(self._permutations[n])
+
+    def shuffle(self, x):
+        """Randomizes the order of the list x in place."""
+        x[:] = [x[i] for i in self.permutation(len(x))]
@@ -0,0 +1,177 @@
+"""This module plays blackjack against a TableServer and measures how fast the server is.
+
+Each client is a bot that connects to the server (see the server module for the protocol) and plays
+by a strategy chart. A load test connects many bots at once and measures how many rounds the server
+plays each second and how long the server takes to answer each decision: the time from a bot sending
+its decision to the next message arriving from the server.
+
+The module can be run as a script. If no port is given, a server is started in the same process
+(and the same event loop), which is quick to try but shares the CPU between the server and the bots:
+
+    python3 -m blackjack.server --port 8765 &
+    python3 -m blackjack.client --port 8765 --clients 200 --rounds 500
+
+The following are included in this module:
+    play : A coroutine that plays rounds against a server as one bot.
+    load_test : A coroutine that plays rounds against a server with many bots at once.
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from .rules import (
+    HIT,
+    STAND)
+from .server import TableServer
+from .strategy import (
+    BASIC_STRATEGY,
+    hit_table)
+from .tables import hand_state
+
+_basic_hits = None  # made the first time a bot plays basic strategy, then shared by every bot
+
+
+def _hits(chart):
+    """Returns the hit table of chart, or of basic strategy if chart is None."""
+    global _basic_hits
+    if chart is not None:
+        return hit_table(chart)
+    if _basic_hits is None:
+        _basic_hits = hit_table(BASIC_STRATEGY)
+    return _basic_hits
+
+
+async def play(host, port, n_rounds, name='Bot', bet=1, chart=None):
+    """Plays n_rounds against the server at host and port, then quits. Returns a list of how long the server
+    took to answer each decision, in seconds.
+
+    Parameters
+    ----------
+        host : str
+            The address of the server.
+
+        port : int
+            The port of the server.
+
+        n_rounds : int
+            The number of rounds to play.
+
+        name : str
+            The bot's name. The default is 'Bot'.
+
+        bet : float
+            The bot's bet on every round. The default is 1.
+
+        chart : dict or None
+            The strategy chart the bot plays by (see the strategy module). If None (the default), the bot
+            uses basic strategy.
+    """
+
+    hits = _hits(chart)
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+    try:
+        writer.write(json.dumps({'name': name, 'bet': bet}).encode() + b'\n')
+        rounds = 0
+        sent = None
+        while rounds < n_rounds:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError(f'the server closed the connection after {rounds} rounds')
+            if sent is not None:
+                latencies.append(perf_counter() - sent)
+                sent = None
+
+            message = json.loads(line)
+            if message['type'] == 'decision':
+                action = HIT if hits[hand_state(message['cards'])][message['upcard']] else STAND
+                writer.write(json.dumps({'id': message['id'], 'action': action}).encode() + b'\n')
+                sent = perf_counter()
+            elif message['type'] == 'result':
+                rounds += 1
+            elif message['type'] == 'error':
+                raise ValueError(f"the server sent an error: {message['message']}")
+
+        writer.write(b'{"type":"quit"}\n')
+        await writer.drain()
+    finally:
+        writer.close()
+    return latencies
+
+
+async def load_test(host, port, clients=100, n_rounds=100):
+    """Plays n_rounds with each of clients bots at once against the server at host and port. Returns the
+    results as a dict that can be saved as JSON.
+
+    The results are the number of rounds played, the number of seconds it took, the rounds played each
+    second, and the mean, median, 99th percentile, and longest time the server took to answer a decision.
+    """
+
+    if clients < 1:
+        raise ValueError('there must be at least one client')
+
+    start = perf_counter()
+    results = await asyncio.gather(*(play(host, port, n_rounds, name=f'Bot {index}')
+                                     for index in range(clients)))
+    seconds = perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    if latencies:
+        latency = {
+            'mean': sum(latencies) / len(latencies),
+            'p50': latencies[len(latencies) // 2],
+            'p99': latencies[min(len(latencies) * 99 // 100, len(latencies) - 1)],
+            'max': latencies[-1],
+        }
+    else:
+        latency = dict.fromkeys(('mean', 'p50', 'p99', 'max'), 0.0)
+    return {
+        'clients': clients,
+        'rounds': clients * n_rounds,
+        'seconds': seconds,
+        'rounds_per_second': clients * n_rounds / seconds,
+        'decisions': len(latencies),
+        'latency': latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures how fast a blackjack table server is.')
+    parser.add_argument('--host', default='127.0.0.1', help='the address of the server (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='the port of the server (default: start a server here)')
+    parser.add_argument('--clients', type=int, default=100, help='bots playing at once (default 100)')
+    parser.add_argument('--rounds', type=int, default=100, help='rounds each bot plays (default 100)')
+    parser.add_argument('--output', help='the file to save the results to as JSON')
+    args = parser.parse_args()
+
+    async def test():
+        if args.port is not None:
+            return await load_test(args.host, args.port, args.clients, args.rounds)
+        server = TableServer(args.host)
+        await server.start()
+        try:
+            return await load_test(args.host, server.port, args.clients, args.rounds)
+        finally:
+            await server.close()
+
+    try:
+        results = asyncio.run(test())
+    except (ValueError, OSError) as error:
+        parser.error(str(error))
+
+    latency = results['latency']
+    print(f"{results['rounds']:,} rounds by {results['clients']} clients in {results['seconds']:.2f} s: "
+          f"{results['rounds_per_second']:,.0f} rounds/s")
+    print(f"{results['decisions']:,} decisions answered in {latency['mean'] * 1e3:.3f} ms on average, "
+          f"{latency['p50'] * 1e3:.3f} ms median, {latency['p99'] * 1e3:.3f} ms 99th percentile, "
+          f"{latency['max'] * 1e3:.3f} ms at most")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""This module defines card counting systems that keep a running count of the cards drawn from a deck.
+
+A counting system gives every rank a tag. Each time a card is drawn, its tag is added to the running
+count, so keeping the count up to date costs one lookup per card no matter how big the deck is. The
+true count is the running count divided by the number of decks left, which the deck already knows.
+
+A counter is attached to a deck (or shoe) with the deck's counter parameter or attribute:
+
+    shoe = Shoe(decks=6, counter=HiLo())
+
+The following classes are included in this module:
+    Counter
+    HiLo
+    KO
+
+The following tags are also included. Each is a tuple of 13 tags for Ace, 2, 3, ... King.
+    HI_LO_TAGS
+    KO_TAGS
+"""
+
+CARDS_PER_DECK = 52
+
+HI_LO_TAGS = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+KO_TAGS = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1)
+
+
+class Counter():
+    """A card counting system. Keeps a running count of the cards drawn from the deck it is attached to.
+
+    Parameters
+    ----------
+        tags : sequence
+            The tag of each rank, in the order Ace, 2, 3, ... King. Any 13 numbers can be used,
+            so any counting system can be made from this class.
+
+        initial : int or float
+            The running count of a freshly shuffled deck. The default is 0.
+
+    Data Attributes
+    ---------------
+        cards_left : int
+            The number of cards left in the deck. 0 if the counter isn't attached to a deck.
+
+        decks_left : float
+            The number of decks left in the deck (cards_left / 52).
+
+        deck : Deck or None
+            The deck the counter is attached to.
+
+        running : int or float
+            The running count: the initial count plus the tags of every card seen since the deck was shuffled.
+
+        true_count : float
+            The running count divided by the number of decks left. If no cards are left, the running count.
+
+        tags : tuple
+            The tag of each rank, in the order Ace, 2, 3, ... King.
+
+    Methods
+    -------
+        reset() :
+            Sets the running count back to the initial count. Called by the deck when it is reshuffled.
+            Returns None
+
+        see(card) :
+            Adds the tag of card to the running count. Called by the deck when a card is drawn.
+            Returns None
+
+        unsee(card) :
+            Takes the tag of card back out of the running count. The Game uses this for the dealer's
+            facedown card, which is only counted once it is turned over.
+            Returns None
+
+    Notes
+    -----
+        A counter can only be attached to one deck at a time. Attaching it to another deck detaches it
+        from the first.
+    """
+
+    def __init__(self, tags, initial=0):
+        if len(tags) != 13:
+            raise ValueError('a counter needs a tag for each of the 13 ranks')
+
+        self._tags = (0,) + tuple(tags)  # indexed by rank, so _tags[0] is unused
+        self._initial = initial
+        self._running = initial
+        self.deck = None
+
+    @property
+    def tags(self):
+        return self._tags[1:]
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def cards_left(self):
+        return 0 if self.deck is None else len(self.deck)
+
+    @property
+    def decks_left(self):
+        return self.cards_left / CARDS_PER_DECK
+
+    @property
+    def true_count(self):
+        decks_left = self.decks_left
+        if not decks_left:
+            return float(self._running)
+        return self._running / decks_left
+
+    def _start(self):
+        """Returns the running count of a freshly shuffled deck. Subclasses can base this on the deck's size."""
+        return self._initial
+
+    def reset(self):
+        """Sets the running count back to the count of a freshly shuffled deck."""
+        self._running = self._start()
+
+    def see(self, card):
+        """Adds the tag of card to the running count."""
+        self._running += self._tags[card._value]  # value is None for facedown cards
+
+    def unsee(self, card):
+        """Takes the tag of card back out of the running count."""
+        self._running -= self._tags[card._value]
+
+    def __str__(self):
+        return f'{type(self).__name__}: running count {self._running}, true count {self.true_count:.2f}'
+
+
+class HiLo(Counter):
+    """The Hi-Lo counting system. Extends the Counter class.
+
+    2 to 6 count +1, 7 to 9 count 0, and 10s, face cards, and Aces count -1. Hi-Lo is balanced: a full
+    deck counts to 0, so the running count starts at 0.
+    """
+
+    def __init__(self):
+        super().__init__(HI_LO_TAGS)
+
+
+class KO(Counter):
+    """The Knock-Out (KO) counting system. Extends the Counter class.
+
+    2 to 7 count +1, 8 and 9 count 0, and 10s, face cards, and Aces count -1. KO is unbalanced: a full
+    deck counts to +4, so the running count starts at 4 - 4 * decks and ends at about +4, which lets
+    players bet on the running count without working out a true count.
+    """
+
+    def __init__(self):
+        super().__init__(KO_TAGS)
+
+    def _start(self):
+        decks = round(self.cards_left / CARDS_PER_DECK)
+        return 4 - 4 * decks
@@ -1,9 +1,29 @@
 """This module defines a game of blackjack and includes the Game class."""
 
+from time import perf_counter
+
 from .cards import Deck
 from .players import (
+    Hand,
     HumanPlayer,
     Dealer,)
+from .results import (
+    WIN,
+    LOSE,
+    BUST,
+    PUSH,
+    BLACKJACK,
+    SURRENDER,
+    PlayerResult,
+    RoundResult,
+    Tally)
+from .rules import (
+    HIT,
+    STAND,
+    DOUBLE,
+    SPLIT,
+    ACTIONS,
+    Rules)
 
 
 class Game():
@@ -20,6 +40,50 @@ class Game():
             If True (the default), the game will print a summary of what's happening in the game.
             If False, the game will run without printing anything to the terminal.
 
+        deck : Deck or None
+            The deck (or shoe) the game is dealt from. If None (the default), the game uses a standard
+            52 card deck that is reshuffled before every round. A Shoe is only reshuffled once its
+            cut card is reached. If the deck has a counter, every player is given the counter when
+            the cards are dealt.
+
+        rng : random.Random, int, or None
+            The random number generator (or seed) for the default deck. If None (the default), the
+            random module's shared generator is used. Only used when deck is None, because a deck
+            brings its own random number generator.
+
+        rules : Rules or None
+            The rules of the table (see the rules module). If None (the default), the table uses Rules().
+
+        history : HistoryWriter or None
+            Records every round the game plays (see the history module): the cards drawn, each hand's
+            decisions, and how each hand turned out. If None (the default), nothing is recorded. The
+            deck can't draw with replacement, since its cards are read back after each round.
+
+        profiler : Profiler or None
+            Times each phase of every round and every decision (see the profiling module). If None (the
+            default), nothing is timed.
+
+    Data Attributes
+    ---------------
+        rules : Rules
+            The rules of the table.
+
+        history : HistoryWriter or None
+            The writer the game records its rounds with.
+
+        profiler : Profiler or None
+            The profiler timing the game. It can be set or removed between rounds.
+
+    Methods
+    -------
+        seed(a) :
+            Seeds the random number generator of the game's deck.
+            Returns None
+
+        simulate(n_rounds) :
+            Plays n_rounds of blackjack without printing anything.
+            Returns a Tally of the outcomes.
+
     Notes
     -----
         A New Game :
@@ -30,6 +94,25 @@ class Game():
                 game = Game(alice, bob) # creats a Game instance with all player objects
                 game() # starts a new game of blackjack
 
+        Counting :
+            A deck's counter sees every card as it is drawn, except the dealer's facedown card. That card
+            is taken back out of the count when it is dealt and counted when the dealer turns it over,
+            so the count never tells the players anything they couldn't see at a real table.
+
+        Betting :
+            Before the cards are dealt, every player's wager() method is called for their bet. At the end
+            of the round each hand's winnings (its payoff under the rules times the bet) are added to the
+            player's bankroll. A double down doubles the bet on that hand and a split hand gets the same
+            bet as the hand it was split from.
+
+        Naturals :
+            The dealer checks for blackjack after the deal. If the dealer has blackjack, no one takes a
+            turn. A player with blackjack doesn't take a turn either.
+
+        Results :
+            Calling a game object returns a RoundResult with each hand's final value, outcome, number
+            of hits, winnings, and wager, the dealer's final hand value, and the number of cards drawn.
+            RoundResults can be collected with a Tally.
 
         ALL players MUST have the following methods defined.
             begin_turn()
@@ -42,51 +125,154 @@ class Game():
 
                 return True if the player hits
                 return False if the player stays
+                return one of the actions in the rules module (like DOUBLE or SPLIT) to take that action.
+                The action must be allowed by the rules (see Rules.actions()).
 
             clean_up()
                 Called at the end of the game. Generally, the player dicards and had_turn is set to False in
                 in preparation for their turn.
     """
 
-    def __init__(self, *players, summary=True):
+    def __init__(self, *players, summary=True, deck=None, rng=None, rules=None, history=None, profiler=None):
+        if deck is not None and rng is not None:
+            raise ValueError('pass rng to the deck, not the game, when the game is given a deck')
+        if history is not None and deck is not None and deck.replacement:
+            raise ValueError("a game can't record its history when the deck draws with replacement")
+
         self._summary = summary
-        self._dealer = Dealer()
+        self._rules = rules if rules is not None else Rules()
+        self._dealer = Dealer(self._rules)
         self._players = players
-        self._deck = Deck()
+        self._deck = deck if deck is not None else Deck(rng=rng)
+        self.history = history
+        self.profiler = profiler
+
+    @property
+    def rules(self):
+        return self._rules
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler = profiler
+        # Decisions are only timed while there is a profiler, so an unprofiled game never looks at the clock.
+        if profiler is None:
+            self.__dict__.pop('_get_decision', None)
+        else:
+            self._get_decision = self._timed_decision
 
     def __call__(self):
-        if self._summary:
-            self._anounce('New Game!')
-
+        """Plays one round of blackjack and returns a RoundResult describing how it went."""
+        actions = self._begin_round(self._summary)
+        self._take_bets()
         self._deal()
+        self._mark('deal')
         for player in self._players:
-            self._turn_sequance(player)
+            self._turn_sequance(player, actions=actions)
+        self._mark('players')
+        self._reveal_hole_card()
         self._turn_sequance(self._dealer)
+        self._mark('dealer')
+        return self._end_round(self._summary, actions)
+
+    # The steps of a round before the bets and after the dealer's turn are shared with AsyncGame, which
+    # only awaits the steps in between.
+
+    def _begin_round(self, summary):
+        """Starts the profiler's clock, reshuffles the deck if it needs it, and marks the start of the round.
+        Returns a list for the actions taken with each hand if the round is recorded, otherwise None."""
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.start()
+        if summary:
+            self._anounce('New Game!')
 
-        if self._summary:
-            self._results()
+        if self._deck.needs_shuffle:
+            self._deck.reshuffle()
+            if profiler is not None:
+                profiler.reshuffles += 1
+        self._deck.start_round()
+        self._mark('shuffle')
+        return [] if self.history is not None else None
+
+    def _mark(self, phase):
+        """Tells the profiler (if the game has one) that phase of the round is over."""
+        if self._profiler is not None:
+            self._profiler.mark(phase)
+
+    def _reveal_hole_card(self):
+        """Counts the dealer's facedown card, which is about to be turned over."""
+        if self._deck.counter is not None:
+            self._deck.counter.see(self._dealer.hand[0].flip())
+
+    def _end_round(self, summary, actions):
+        """Settles the round, prints and records the results, and clears the table. Returns the RoundResult."""
+        result = self._settle()
+        self._mark('settle')
+        if summary:
+            self._results(result)
+        if actions is not None:
+            hands = ((player.seat, player.outcome, hand_actions, player.payoff, player.wager)
+                     for player, hand_actions in zip(result.players, actions))
+            self.history.record(self._deck.drawn_cards(self._deck.drawn - result.cards_drawn),
+                                result.dealer_value, hands)
+        self._mark('results')
 
         self._clean_up()
+        if self._profiler is not None:
+            self._profiler.mark('clean_up')
+            self._profiler.end_round(result.cards_drawn)
+        return result
 
     def _anounce(self, string_):
         """This bit of code is used a lot, so I'm making a function."""
         print(f'\n\n----- {string_} -----')
 
-    def _deal(self):
+    def _take_bets(self):
+        """Seats every player, then takes their bets for the round."""
+        for player in self._players:
+            self._seat(player)
+            player.hand.bet = self._get_wager(player)
+
+    def _seat(self, player):
+        """Gives player the table's counter, rules, and unseen cards."""
+        player.counter = self._deck.counter
+        player.rules = self._rules
+        player._unseen = self._unseen
+
+    def _unseen(self):
+        """Returns the number of cards of each rank the players haven't seen: the cards left in the deck
+        and the dealer's facedown card. This is Player.unseen."""
+        ranks = list(self._deck.ranks)
+        if not self._deck.replacement:  # otherwise the deck's ranks never change
+            for card in self._dealer.hand:
+                if card.is_hidden:
+                    ranks[card.flip().value] += 1
+        return tuple(ranks)
+
+    def _deal(self, summary=None):
         """Deals a game of blackjack. Defines a function to deal to the players and function to deal to the dealer.
-        Resets shuffles the deck. Prints a summary of the deal if summary=True"""
-
-        self._deck.shuffle()
+        Prints a summary of the deal if summary=True"""
+        if summary is None:
+            summary = self._summary
 
+        counter = self._deck.counter
         for player in self._players:
             player.hand.add([self._deck.draw(), self._deck.draw()])
 
-        # Flips one of the dealer's cards facedown.
+        # Flips one of the dealer's cards facedown. Every player can see the other one.
         self._dealer.hand.add([self._deck.draw(), self._deck.draw()])
-        self._dealer.hand[0].flip()
+        if counter is not None:
+            counter.unsee(self._dealer.hand[0])  # counted when the dealer turns it over
+        self._dealer.hand.flip(0)
+        for player in self._players:
+            player.upcard = self._dealer.hand[1]
 
-        # Prints a summary of the deal if _summary is True.
-        if self._summary:
+        # Prints a summary of the deal if summary is True.
+        if summary:
             self._anounce('The Dealer')
             print(self._dealer.hand)
 
@@ -94,65 +280,351 @@ class Game():
                 self._anounce(f'{player.name} with {player.hand.value}')
                 print(player.hand)
 
-    def _get_decision(self, player):
-        decision = player.decision()
+    def _get_wager(self, player):
+        """Returns the player's bet for the round."""
+        return self._check_wager(player, player.wager())
 
-        if decision is True or decision is False:
-            return decision
+    def _check_wager(self, player, wager):
+        """Returns wager if it is a bet the player can make."""
+        if wager <= 0:
+            raise ValueError(f'{player.name} must bet more than nothing, not {wager}')
+        return wager
+
+    def _get_decision(self, player):
+        """Returns the action the player chooses: HIT, STAND, or another action from the rules module."""
+        return self._action(player, player.decision())
+
+    def _action(self, player, decision):
+        """Returns the action the player's decision stands for, if the table's rules allow it."""
+        if decision is True:
+            action = HIT
+        elif decision is False:
+            return STAND
+        elif decision in ACTIONS:
+            action = decision
         else:
             raise TypeError(
-                "The turn method of a Player object should return a bool: True or 'hit' or False for 'stay'")
+                "The turn method of a Player object should return a bool: True or 'hit' or False for 'stay', "
+                "or an action from the rules module")
+
+        # Hitting is always allowed unless the hand is split Aces, so the rules are only checked when needed.
+        if ((action != HIT or player.hand.is_split)
+                and action not in self._rules.actions(player.hand, len(player.hands))):
+            raise ValueError(f"{player.name} can't {action} with this hand under the table's rules")
+        return action
 
-    def _turn_sequance(self, player):
-        """Defines a turn sequence for an individual player
+    def _timed_decision(self, player):
+        """Used in place of _get_decision() while the game has a profiler. Times the decision."""
+        start = perf_counter()
+        action = Game._get_decision(self, player)
+        self._profiler.decision(player.name, perf_counter() - start)
+        return action
+
+    def _turn_sequance(self, player, summary=None, actions=None):
+        """Defines a turn sequence for an individual player, including every hand the player splits into.
+
+        If actions is a list, a list of the actions taken with each hand is added to it.
 
         This method should work for ANY Player object, therefore
         ALL Player objects need a begin_turn() method and a decision() method.
         """
+        return self._play(self._turn(player, summary, actions), player)
+
+    def _play_hand(self, player, summary, actions=None):
+        """Plays player.hand until the player stays, busts, or takes an action that ends the hand.
+        Every action taken is added to actions if it is a list."""
+        return self._play(self._hand(player, summary, actions), player)
+
+    def _play(self, steps, player):
+        """Runs steps (see _turn()) to the end, sending it each of the player's decisions.
+
+        AsyncGame overrides this with a coroutine, so there _turn_sequance() and _play_hand() return
+        a coroutine to await.
+        """
+        action = None
+        while True:
+            try:
+                steps.send(action)
+            except StopIteration:
+                return
+            action = self._get_decision(player)
+
+    def _turn(self, player, summary, actions):
+        """A generator that plays the player's turn, one hand after another. It yields each time the player
+        needs to decide and is sent back the action. Splitting adds hands while the player is playing."""
+        if summary is None:
+            summary = self._summary
 
         player.begin_turn()
-        hand_value = player.hand.value
-        if self._summary:
-            self._anounce(f'{player.name} with {hand_value}')
-            print(player.hand)
-
-        while hand_value <= 21:
-            decision = self._get_decision(player)
-            if decision:
-                player.hand.add(self._deck.draw())
-                hand_value = player.hand.value
-                if self._summary:
-                    print(f'{player.name} hits.\n')
-                    print(player.hand)
-                    print(f'\n{player.name} has {hand_value}.\n')
+        hands = player.hands
+        index = 0
+        while index < len(hands):
+            player.hand = hands[index]
+            if actions is None:
+                yield from self._hand(player, summary)
             else:
-                if self._summary:
-                    print(f'{player.name} stays with {hand_value}.\n')
-                break
+                hand_actions = []
+                actions.append(hand_actions)
+                yield from self._hand(player, summary, hand_actions)
+            index += 1
+        player.hand = hands[0]
 
         player.had_trun = True  # Do I really need this?
 
-        if hand_value > 21 and self._summary:
+    def _hand(self, player, summary, actions=None):
+        """A generator that plays player.hand, yielding for each decision like _turn()."""
+
+        if self._begin_hand(player, summary):
+            return
+
+        hand = player.hand
+        while hand.value <= 21:
+            action = yield
+            if actions is not None:
+                actions.append(action)
+            if self._take_action(player, action, summary):
+                break
+
+        if hand.value > 21 and summary:
             print(f'{player.name} busts!\n\n')
 
-    def _results(self):
+    def _begin_hand(self, player, summary):
+        """Shows player.hand if summary is True. Returns True if the hand is already finished: a blackjack,
+        a dealer blackjack, or split Aces."""
+
+        hand = player.hand
+        if summary:
+            self._anounce(f'{player.name} with {hand.value}')
+            print(hand)
+
+        if hand.is_blackjack:
+            if summary:
+                print(f'{player.name} has blackjack!\n')
+            return True
+        if self._dealer.hand.is_blackjack:
+            if summary:
+                print('The dealer has blackjack.\n')
+            return True
+        return hand.is_split and self._is_finished(player)
+
+    def _take_action(self, player, action, summary):
+        """Takes action with player.hand. Returns True if the action ends the hand (other than by busting)."""
+
+        hand = player.hand
+        if action == HIT or action == DOUBLE:
+            hand.add(self._deck.draw())
+            if summary:
+                print(f'{player.name} {"hits" if action == HIT else "doubles down"}.\n')
+                print(hand)
+                print(f'\n{player.name} has {hand.value}.\n')
+            if action == DOUBLE:
+                hand.doubled = True
+                return True
+            return False
+        elif action == SPLIT:
+            self._split(player)
+            if summary:
+                print(f'{player.name} splits.\n')
+                print(hand)
+                print(f'\n{player.name} has {hand.value}.\n')
+            return self._is_finished(player)
+        elif action == STAND:
+            if summary:
+                print(f'{player.name} stays with {hand.value}.\n')
+            return True
+        else:
+            hand.surrendered = True
+            if summary:
+                print(f'{player.name} surrenders.\n')
+            return True
+
+    def _is_finished(self, player):
+        """Returns True if the rules leave player.hand nothing to do but stand (split Aces)."""
+        return self._rules.actions(player.hand, len(player.hands)) == (STAND,)
+
+    def _split(self, player):
+        """Splits the pair in player.hand into two hands and deals a second card to each."""
+
+        hand = player.hand
+        new_hand = Hand()
+        new_hand.add(hand.draw())
+        hand.is_split = new_hand.is_split = True
+        new_hand.bet = hand.bet
+        player.hands.insert(player.hands.index(hand) + 1, new_hand)
+
+        hand.add(self._deck.draw())
+        new_hand.add(self._deck.draw())
+
+    def _settle(self):
+        """Settles every player's hands against the dealer's, pays the players, and returns a RoundResult."""
+
+        dealer_hand = self._dealer.hand
+        settle = self._rules.settle
+        players = []
+        cards_drawn = len(dealer_hand)
+        for seat, player in enumerate(self._players):
+            for hand in player.hands:
+                outcome, payoff = settle(hand, dealer_hand)
+                won = payoff * hand.bet
+                wager = hand.bet * 2 if hand.doubled else hand.bet
+                player.bankroll += won
+                players.append(PlayerResult(player.name, hand.value, outcome, len(hand) - 2, seat, won, wager))
+                cards_drawn += len(hand)
+
+        return RoundResult(players=tuple(players), dealer_value=dealer_hand.value, cards_drawn=cards_drawn)
+
+    def _results(self, result):
         """Prints the outcome of the game player by player"""
         self._anounce('Final Results')
-        dealer_score = self._dealer.hand.value
 
-        for player in self._players:
-            player_score = player.hand.value
-            if player_score <= 21:
-                if player_score < dealer_score <= 21:
-                    self._anounce(f'{player.name} Loses!')
-                else:
-                    self._anounce(f'{player.name} Wins!')
-            else:
-                self._anounce(f'{player.name} Busts!')
+        messages = {WIN: 'Wins!', LOSE: 'Loses!', BUST: 'Busts!', PUSH: 'Pushes.',
+                    BLACKJACK: 'Wins with Blackjack!', SURRENDER: 'Surrenders.'}
+        for player in result.players:
+            self._anounce(f'{player.name} {messages[player.outcome]}')
 
     def _clean_up(self):
-        """Players discard to prepare for new game."""
+        """Players discard to prepare for new game. The deck collects its cards when the next game is dealt."""
         for player in self._players:
             player.clean_up()
         self._dealer.clean_up()
-        self._deck.reset()
+
+    def seed(self, a=None):
+        """Seeds the random number generator of the game's deck, making the following rounds reproducible.
+        The deck is reshuffled (see Deck.seed()), so a shoe starts over. The seed is recorded to the game's
+        history, if it has one."""
+        if self.history is not None:
+            self.history.record_seed(a)
+        self._deck.seed(a)
+
+    def simulate(self, n_rounds):
+        """Plays n_rounds of blackjack as quickly as possible and returns a Tally of the outcomes.
+
+        Players make their decisions and bets exactly like they do in a normal game, their bankrolls are
+        paid the same way, the deck is reshuffled between rounds the same way, and the rounds are recorded
+        to the game's history (if it has one), but nothing is printed and no results are built for
+        individual rounds.
+        """
+
+        tally = Tally(player.name for player in self._players)
+        players = self._players
+        dealer = self._dealer
+        dealer_hand = dealer.hand
+        dealer_hits = self._rules.dealer_hits
+        everyone = tuple(players) + (dealer,)
+        turn = self._turn_sequance
+        play_hand = self._play_hand
+        take_action = self._take_action
+        action = self._action
+        check_wager = self._check_wager
+        settle = self._rules.settle
+        deck = self._deck
+        draw = deck.draw
+        draw_many = deck.draw_many
+        n_dealt = 2 * len(everyone)
+        counter = deck.counter
+        history = self.history
+        profiler = self._profiler
+        for player in players:
+            self._seat(player)
+
+        for _ in range(n_rounds):
+            if profiler is not None:
+                profiler.start()
+            if deck.needs_shuffle:
+                deck.reshuffle()
+                if profiler is not None:
+                    profiler.reshuffles += 1
+            deck.start_round()
+            if profiler is not None:
+                profiler.mark('shuffle')
+
+            for player in players:
+                player.hand.bet = check_wager(player, player.wager())  # like _get_wager(), one call fewer
+            dealt = draw_many(n_dealt)
+            for index, player in enumerate(everyone):
+                player.hand.add(dealt[2 * index:2 * index + 2])
+            if counter is not None:
+                hole_card = dealer_hand[0]
+                counter.unsee(hole_card)  # counted when the dealer turns it over
+            dealer_hand.flip(0)  # facedown until the dealer's turn, like in __call__()
+            upcard = dealer_hand[1]
+            for player in players:
+                player.upcard = upcard
+            if profiler is not None:
+                profiler.mark('deal')
+
+            dealer_blackjack = dealer_hand.is_blackjack
+            if history is not None:
+                actions = []
+                for player in players:
+                    turn(player, False, actions)
+                actions = iter(actions)
+                hands = []
+            elif profiler is not None:
+                for player in players:
+                    turn(player, False)
+            else:
+                # The same turns as _turn_sequance(), with hitting and standing on a hand that hasn't been
+                # split played right here. Those are most decisions, and they never need the rules.
+                for player in players:
+                    player.begin_turn()
+                    hand = player.hand
+                    if not (dealer_blackjack or hand.is_blackjack):
+                        while hand.value <= 21:
+                            decision = player.decision()
+                            if decision is True and not hand.is_split:
+                                hand.add(draw())
+                            elif decision is False or take_action(player, action(player, decision), False):
+                                break
+                    player_hands = player.hands
+                    index = 1
+                    while index < len(player_hands):  # the hands split off from the first one
+                        player.hand = player_hands[index]
+                        play_hand(player, False)
+                        index += 1
+                    player.hand = player_hands[0]
+                    player.had_trun = True
+            if profiler is not None:
+                profiler.mark('players')
+            if counter is not None:
+                counter.see(hole_card)
+            if profiler is not None:
+                turn(dealer, False)
+                profiler.mark('dealer')
+            else:
+                # The dealer's turn, like _turn_sequance() with Dealer.begin_turn() and Dealer.decision().
+                # Only the facedown card needs turning over.
+                dealer_hand.flip(0)
+                if not dealer_blackjack:
+                    while dealer_hits[dealer_hand.state]:
+                        dealer_hand.add(draw())
+                dealer.had_trun = True
+
+            cards_drawn = len(dealer_hand)
+            for seat, player in enumerate(players):
+                for hand in player.hands:
+                    outcome, payoff = settle(hand, dealer_hand)
+                    bet = hand.bet
+                    won = payoff * bet
+                    wager = bet * 2 if hand.doubled else bet
+                    player.bankroll += won
+                    n_cards = len(hand)
+                    tally.record(seat, outcome, n_cards - 2, won, wager)
+                    cards_drawn += n_cards
+                    if history is not None:
+                        hands.append((seat, outcome, next(actions), won, wager))
+                player.clean_up()
+            tally.cards_drawn += cards_drawn
+            if profiler is not None:
+                profiler.mark('settle')
+            if history is not None:
+                history.record(deck.drawn_cards(deck.drawn - cards_drawn), dealer_hand.value, hands)
+                if profiler is not None:
+                    profiler.mark('results')
+            dealer.clean_up()
+            if profiler is not None:
+                profiler.mark('clean_up')
+                profiler.end_round(cards_drawn)
+
+        tally.rounds += n_rounds
+        return tally
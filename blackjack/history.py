@@ -0,0 +1,458 @@
+"""This module records every round of a game to a compact binary file and reads it back.
+
+A Game given a HistoryWriter records each round it plays: every card drawn from the deck (in the
+order it was drawn), every decision each hand made, and how each hand turned out. Rounds are packed
+into a buffer and written to the file in large blocks, so recording costs far less than printing a
+summary. A HistoryReader memory-maps the file and reads one round at a time, so files with hundreds
+of millions of rounds can be read without loading them.
+
+The file is append-only. It starts with a header (see _HEADER) and then holds one record per round:
+
+    size      uint16   the number of bytes in the rest of the record
+    n_cards   uint16   the number of cards drawn during the round
+    cards     n_cards bytes, one per card: the card's value (1 to 13) plus 16 times its suit (see SUITS)
+    dealer    uint8    the value of the dealer's final hand
+    n_hands   uint8    the number of player hands (more than one per player after splitting)
+
+    and then for each hand, in seat order:
+
+    seat        uint8    the seat of the hand's player
+    outcome     uint8    the outcome, as an index into OUTCOMES (see the results module)
+    n_actions   uint8    the number of decisions made with the hand
+    actions     n_actions bytes, each an index into ACTIONS (see the rules module)
+    payoff      float32  the amount the hand won (negative if it lost)
+    wager       float32  the amount wagered on the hand
+
+A record with a size of 0 isn't a round. It is written when the game is seeded (see Game.seed()), and
+the rounds after it were dealt from that seed:
+
+    seed      uint64   the seed
+    has_seed  uint8    0 if the game was seeded with None, so the rounds after it can't be dealt again
+
+All numbers are little-endian. Version 1 files have no seed records and can still be read.
+
+The following are included in this module:
+    HistoryWriter : Records rounds to a file.
+    HistoryReader : Reads recorded rounds from a file.
+    RoundRecord, HandRecord : The rounds and hands read from a file.
+    ReplayPlayer : A player that makes the recorded decisions of one seat again.
+    replay : Plays the recorded rounds again, with the recorded players or new ones.
+    SUITS : The suits a card's byte can stand for.
+    encode_card, decode_cards : Convert between cards and bytes.
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from .cards import (
+    Card,
+    ReplayDeck)
+from .game import Game
+from .players import Player
+from .results import OUTCOMES
+from .rules import (
+    DOUBLE,
+    ACTIONS)
+
+SUITS = ('Spades', 'Hearts', 'Diamonds', 'Clubs')
+
+_MAGIC = b'BJHIST'
+_VERSION = 2
+_READABLE = (1, 2)  # the versions a reader can read
+_HEADER = struct.Struct('<6sBxQ?7x')  # magic, version, seed, has seed
+_SIZE = struct.Struct('<H')
+_SEED = struct.Struct('<Q?')  # seed, has seed
+_COUNT = struct.Struct('<H')
+_ROUND = struct.Struct('<BB')  # dealer value, number of hands
+_HAND = struct.Struct('<BBB')  # seat, outcome, number of actions
+_MONEY = struct.Struct('<ff')  # payoff, wager
+
+_SUIT_CODES = {suit: index << 4 for index, suit in enumerate(SUITS)}
+_OUTCOME_CODES = {key: index for index, key in enumerate(OUTCOMES)}
+_ACTION_CODES = {action: index for index, action in enumerate(ACTIONS)}
+
+RoundRecord = namedtuple('RoundRecord', ['cards', 'dealer_value', 'hands', 'seed'])
+RoundRecord.__doc__ = """One recorded round: the cards drawn from the deck (as bytes, see decode_cards()), the value
+of the dealer's final hand, a tuple of HandRecords in seat order, and the seed the game was last seeded with
+before the round (the seed in the file's header if the game wasn't seeded while it was recorded, or None)."""
+
+HandRecord = namedtuple('HandRecord', ['seat', 'outcome', 'actions', 'payoff', 'wager'])
+HandRecord.__doc__ = """One recorded hand: the player's seat, the outcome, a tuple of the actions taken with the hand
+(in order), the amount the hand won, and the amount wagered on it."""
+
+
+# The byte of every card recorded so far, by id(card). Every card is only made once and is never
+# deleted (see the Card class), so its id always stands for the same card.
+_CARD_CODES = {}
+
+# The card each byte stands for.
+_CARDS = {index << 4 | value: Card(value, suit) for index, suit in enumerate(SUITS) for value in range(1, 14)}
+
+
+def encode_card(card):
+    """Returns the byte that stands for card: its value plus 16 times the index of its suit in SUITS."""
+    try:
+        return card._value | _SUIT_CODES[card._suit]
+    except KeyError:
+        raise ValueError(f'only cards of the suits in SUITS can be recorded, not {card._suit!r}') from None
+
+
+def _encode_cards(cards):
+    """Returns the bytes that stand for the cards, encoding each card only the first time it is seen."""
+    try:
+        return bytes([_CARD_CODES[id(card)] for card in cards])
+    except KeyError:
+        for card in cards:
+            _CARD_CODES[id(card)] = encode_card(card)
+        return bytes([_CARD_CODES[id(card)] for card in cards])
+
+
+def decode_cards(data):
+    """Returns a list of the cards stood for by the bytes in data (see encode_card())."""
+    try:
+        return [_CARDS[byte] for byte in data]
+    except KeyError as error:
+        raise ValueError(f'{error.args[0]} is not the byte of a card') from None
+
+
+class HistoryWriter():
+    """Records rounds of blackjack to a file.
+
+    Give the writer to a Game (Game(..., history=writer)) and every round the game plays is recorded.
+    Rounds are kept in a buffer and written to the file when the buffer fills up, so the writer must be
+    closed (or used in a with statement) to write the last rounds.
+
+        Parameters
+        ----------
+            path : str or path-like
+                The file to write to. If the file already has rounds in it, new rounds are added after them.
+
+            seed : int or None
+                The seed the recorded game was seeded with (0 to 2**64 - 1), stored in the file's header
+                for reference. Only used when the file is new. A game also records every seed it is
+                seeded with later (see record_seed()).
+
+            buffer_size : int
+                The number of bytes kept in the buffer before they are written to the file. The default is 1 MiB.
+
+        Data Attributes
+        ---------------
+            path : str or path-like
+                The file being written to.
+
+            rounds : int
+                The number of rounds recorded by this writer.
+
+        Methods
+        -------
+            record(cards, dealer_value, hands) :
+                Records a round. cards are the cards drawn from the deck, in order, and hands is an iterable
+                of (seat, outcome, actions, payoff, wager) for each player hand, in seat order.
+                Returns None
+
+            record_seed(seed) :
+                Records that the game was seeded with seed (0 to 2**64 - 1, or None). The rounds recorded
+                after it were dealt from that seed. Called by Game.seed().
+                Returns None
+
+            flush() :
+                Writes the buffer to the file.
+                Returns None
+
+            close() :
+                Writes the buffer to the file and closes it.
+                Returns None
+    """
+
+    def __init__(self, path, seed=None, buffer_size=1 << 20):
+        _check_seed(seed)
+
+        self.path = path
+        self.rounds = 0
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, seed or 0, seed is not None))
+        elif _check_header(path)[0] != _VERSION:
+            self._file.close()
+            raise ValueError(f'{path} is an older history file, so rounds can\'t be added to it')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, cards, dealer_value, hands):
+        """Adds a round to the buffer, and writes the buffer to the file if it is full."""
+
+        body = bytearray(_COUNT.pack(len(cards)))
+        body += _encode_cards(cards)
+        hands = list(hands)
+        body += _ROUND.pack(dealer_value, len(hands))
+        for seat, outcome, actions, payoff, wager in hands:
+            body += _HAND.pack(seat, _OUTCOME_CODES[outcome], len(actions))
+            body += bytes(map(_ACTION_CODES.__getitem__, actions))
+            body += _MONEY.pack(payoff, wager)
+
+        buffer = self._buffer
+        buffer += _SIZE.pack(len(body))
+        buffer += body
+        self.rounds += 1
+        if len(buffer) >= self._buffer_size:
+            self.flush()
+
+    def record_seed(self, seed):
+        """Records that the game was seeded with seed. Raises a ValueError if seed can't be recorded."""
+        _check_seed(seed)
+        self._buffer += _SIZE.pack(0)
+        self._buffer += _SEED.pack(seed or 0, seed is not None)
+
+    def flush(self):
+        """Writes the buffer to the file."""
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self):
+        """Writes the buffer to the file and closes the file. Closing a closed writer does nothing."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def _check_seed(seed):
+    """Raises a ValueError if seed can't be recorded."""
+    if seed is not None and not (isinstance(seed, int) and 0 <= seed < 2 ** 64):
+        raise ValueError(f'only None and ints from 0 to 2**64 - 1 can be recorded as seeds, not {seed!r}')
+
+
+def _check_header(path):
+    """Raises a ValueError if the file at path doesn't start with a history header that can be read.
+    Returns (version, seed)."""
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f'{path} is not a blackjack history file')
+    magic, version, seed, has_seed = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError(f'{path} is not a blackjack history file')
+    if version not in _READABLE:
+        raise ValueError(f'{path} is a version {version} history file, which can\'t be read')
+    return version, seed if has_seed else None
+
+
+class HistoryReader():
+    """Reads rounds recorded by a HistoryWriter.
+
+    The file is memory-mapped, so only the parts being read are loaded into memory. Iterating over
+    a reader gives a RoundRecord for every recorded round, in the order they were played. A round
+    cut off at the end of the file (if the writer wasn't closed) is skipped.
+
+        Parameters
+        ----------
+            path : str or path-like
+                The file to read.
+
+        Data Attributes
+        ---------------
+            path : str or path-like
+                The file being read.
+
+            seed : int or None
+                The seed stored in the file's header. Seeds recorded later are in each RoundRecord.
+
+        Methods
+        -------
+            cards() :
+                Returns an iterator over the cards drawn in each round (as bytes, see decode_cards()). This
+                skips the rest of each record, so it is faster than iterating over the reader.
+
+            close() :
+                Closes the file.
+                Returns None
+
+        Other Behaviors
+        ---------------
+            Iteration :
+                A reader can be iterated over (more than once) and gives a RoundRecord for each round.
+
+            Length :
+                Passing a reader into the len() method will return the number of rounds in the file.
+                This reads the size of every record, so it takes a moment for a large file.
+
+            with :
+                A reader can be used in a with statement, which closes it at the end.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        _, self.seed = _check_header(path)
+        self._map = None
+        if os.path.getsize(path) > _HEADER.size:  # an empty file can't be memory-mapped
+            with open(path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _records(self):
+        """Yields (size, offset) for every complete record in the file, where offset is just past the size.
+        A size of 0 is a seed record."""
+        data = self._map
+        if data is None:
+            return
+
+        end = len(data)
+        offset = _HEADER.size
+        while offset + _SIZE.size <= end:
+            size, = _SIZE.unpack_from(data, offset)
+            offset += _SIZE.size
+            length = size or _SEED.size
+            if offset + length > end:
+                break
+            yield size, offset
+            offset += length
+
+    def __len__(self):
+        return sum(1 for size, _ in self._records() if size)
+
+    def cards(self):
+        """Yields the cards drawn in each round, as bytes."""
+        data = self._map
+        for size, offset in self._records():
+            if not size:
+                continue
+            n_cards, = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            yield data[offset:offset + n_cards]
+
+    def __iter__(self):
+        data = self._map
+        seed = self.seed
+        for size, offset in self._records():
+            if not size:
+                seed, has_seed = _SEED.unpack_from(data, offset)
+                if not has_seed:
+                    seed = None
+                continue
+
+            n_cards, = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            cards = data[offset:offset + n_cards]
+            offset += n_cards
+            dealer_value, n_hands = _ROUND.unpack_from(data, offset)
+            offset += _ROUND.size
+
+            hands = []
+            for _ in range(n_hands):
+                seat, outcome, n_actions = _HAND.unpack_from(data, offset)
+                offset += _HAND.size
+                actions = tuple(ACTIONS[code] for code in data[offset:offset + n_actions])
+                offset += n_actions
+                payoff, wager = _MONEY.unpack_from(data, offset)
+                offset += _MONEY.size
+                hands.append(HandRecord(seat, OUTCOMES[outcome], actions, payoff, wager))
+
+            yield RoundRecord(cards, dealer_value, tuple(hands), seed)
+
+    def close(self):
+        """Closes the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class ReplayPlayer(Player):
+    """A player that makes the recorded bets and decisions of one seat again. Extends the Player class.
+
+    Parameters
+    ----------
+        name : str
+            The name of the player.
+
+        rounds : iterable of RoundRecord
+            The recorded rounds, for example a HistoryReader. They must be played in the same order.
+
+        seat : int
+            The seat whose bets and decisions are made again. The default is 0.
+
+    Methods
+    -------
+    wager() :
+        Moves on to the next recorded round.
+        Returns the bet recorded for the seat.
+
+    decision() :
+        Returns the next decision recorded for the seat. Raises a ValueError if there are no more,
+        which means the round went differently (for example, because it was played with other rules).
+
+    All other methods are the same as the Player class.
+    """
+
+    def __init__(self, name, rounds, seat=0):
+        super().__init__(name)
+        self._rounds = iter(rounds)
+        self._seat = seat
+        self._actions = iter(())
+
+    def wager(self):
+        hands = [hand for hand in next(self._rounds).hands if hand.seat == self._seat]
+        if not hands:
+            raise ValueError(f'seat {self._seat} was empty in the recorded round')
+        self._actions = iter([action for hand in hands for action in hand.actions])
+
+        # A hand's recorded wager counts a double down, but the bet doesn't.
+        first = hands[0]
+        return first.wager / 2 if first.actions[-1:] == (DOUBLE,) else first.wager
+
+    def decision(self):
+        action = next(self._actions, None)
+        if action is None:
+            raise ValueError(f'{self.name} has no more recorded decisions this round; '
+                             'replay the rounds with the rules they were recorded with')
+        return action
+
+
+def replay(path, *players, rules=None, decks=1, rng=None, n_rounds=None):
+    """Plays the rounds recorded in the file at path again, card for card, and returns a Tally.
+
+    Parameters
+    ----------
+        path : str or path-like
+            The history file to replay.
+
+        *players : Player
+            The players to play the rounds with. If no players are given, a ReplayPlayer makes the
+            recorded decisions of each seat again, which gives exactly the recorded results.
+
+        rules : Rules or None
+            The rules to play by. Use the rules the rounds were recorded with. If None (the default),
+            Rules() is used.
+
+        decks : int
+            The number of decks the rounds were dealt from. See the ReplayDeck class.
+
+        rng : random.Random, int, or None
+            The random number generator for cards drawn past the recorded cards. See the ReplayDeck class.
+
+        n_rounds : int or None
+            The number of rounds to play. If None (the default), every recorded round is played.
+    """
+
+    with HistoryReader(path) as reader:
+        if not players:
+            first = next(iter(reader), None)
+            seats = 1 + max(hand.seat for hand in first.hands) if first is not None else 0
+            players = [ReplayPlayer(f'Seat {seat}', reader, seat) for seat in range(seats)]
+        if n_rounds is None:
+            n_rounds = len(reader)
+
+        deck = ReplayDeck((decode_cards(cards) for cards in reader.cards()), decks, rng)
+        return Game(*players, summary=False, deck=deck, rules=rules).simulate(n_rounds)
@@ -0,0 +1,59 @@
+"""This module runs game simulations on several processes at once.
+
+The following functions are included in this module:
+    simulate
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _simulate(game, n_rounds, seed):
+    """Runs in a worker process. Seeds the worker's random number generators and simulates the game."""
+    random.seed(seed)  # for players that use the random module
+    game.seed(seed)
+    return game.simulate(n_rounds)
+
+
+def simulate(game, n_rounds, workers=None, seed=None):
+    """Splits game.simulate(n_rounds) across several processes and returns the combined Tally.
+
+    Parameters
+    ----------
+        game : Game
+            The game to simulate. Each worker gets its own copy of the game (including the players
+            and the deck), so the game and its players must be picklable. The bankrolls of the players
+            passed in don't change; the tally's won attribute has what each player won.
+
+        n_rounds : int
+            The total number of rounds to play. The rounds are split as evenly as possible between the workers.
+
+        workers : int or None
+            The number of worker processes. If None (the default), one worker is used for each CPU.
+
+        seed : int or None
+            The master seed. Each worker's random number generators (the deck's and the random module's)
+            are seeded with a different seed made from the master seed, so the workers play independent
+            rounds. The same master seed and number of workers always give exactly the same tally. If None
+            (the default), the results are not reproducible.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('there must be at least one worker')
+
+    seeder = random.Random(seed)
+    seeds = [seeder.getrandbits(64) for _ in range(workers)]
+
+    share, extra = divmod(n_rounds, workers)
+    rounds = [share + (worker < extra) for worker in range(workers)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tallies = list(executor.map(_simulate, [game] * workers, rounds, seeds))
+
+    total = tallies[0]
+    for tally in tallies[1:]:
+        total = total + tally
+    return total
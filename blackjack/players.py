@@ -4,10 +4,29 @@ The following classes are included in this module:
     Hand
     Player
     HumanPlayer
+    StrategyPlayer
     Dealer
 """
 
-from .cards import Collection
+from .cards import (
+    Card,
+    Collection)
+from .tables import (
+    TRANSITIONS,
+    VALUES,
+    SOFT,
+    PAIR,
+    BLACKJACK,
+    DEALER_HITS,
+    EMPTY,
+    hand_state)
+from .strategy import (
+    BASIC_STRATEGY,
+    load_chart,
+    hit_table)
+from .rules import (
+    HIT,
+    STAND)
 
 
 class Hand(Collection):
@@ -21,7 +40,37 @@ class Hand(Collection):
     Data Attributes
     ---------------
         value : int
-            The value of the hand as determined by the rules of blackjack.
+            The value of the hand as determined by the rules of blackjack. A bust hand is worth at most
+            31 points (tables.MAX_HARD): a Game never adds a card to a bust hand, so 31 is as high as
+            a hand can go in play, and a hand with more points (like four Kings) also reports 31.
+
+        is_soft : bool
+            True if an Ace in the hand is being counted as 11 points.
+
+        is_pair : bool
+            True if the hand is two cards worth the same number of points.
+
+        is_blackjack : bool
+            True if the hand is exactly two cards worth 21 points and wasn't made by splitting.
+
+        is_bust : bool
+            True if the hand is worth more than 21 points.
+
+        state : int
+            The state of the hand in the lookup tables of the tables module. Adding a card to a hand
+            is a single table lookup, and every attribute above is read straight from a table.
+
+        is_split : bool
+            True if the hand was made by splitting a pair. Set by the Game object.
+
+        doubled : bool
+            True if the player doubled down on the hand. Set by the Game object.
+
+        surrendered : bool
+            True if the player surrendered the hand. Set by the Game object.
+
+        bet : float
+            The amount bet on the hand, not counting a double down. Set by the Game object.
 
     Methods
     -------
@@ -35,19 +84,23 @@ class Hand(Collection):
                     The card or list of cards to be added to the hand.
 
         draw() :
-            Removes a single card from the hand and returns that card.
+            Removes the first card from the hand and returns that card.
             Returns Card
 
         discard() :
             Removes all cards from the hand.
             Returns None
 
+        flip(index) :
+            Turns over the card at the given index.
+            Returns None
+
         hide() :
-            Sets the is_hidden attribute for each card in the hand to True.
+            Turns every card in the hand facedown, so is_hidden is True for each card.
             Returns None
 
         reveal() :
-            Sets the is_hidden attribute for each card in the hand to False.
+            Turns every card in the hand faceup, so is_hidden is False for each card.
             Returns None
 
         shuffle() :
@@ -82,30 +135,76 @@ class Hand(Collection):
     def __init__(self):
         """A Hand object will always be constructed with an empty _cards list and replacement set to False"""
         super().__init__()
-        self._value = 0
+        self._state = EMPTY  # see the tables module
+        self.is_split = False
+        self.doubled = False
+        self.surrendered = False
+        self.bet = 0
 
     @property
     def value(self):
-        return self._value
+        return VALUES[self._state]
 
-    def _update_value(self) -> int:
-        """Updates value. This is called whenever a card is added to Hand object."""
+    @property
+    def is_soft(self):
+        return SOFT[self._state]
 
-        value_list = [card.value if card.value <= 10 else 10 for card in self]
-        hand_value = sum(value_list)
+    @property
+    def is_pair(self):
+        return PAIR[self._state]
 
-        # Checks to see if any Aces can be worth 11 points instead of 1 point
-        while value_list.count(1) > 0 and (21 - hand_value) >= 10:
-            value_list[value_list.index(1)] = 11
-            hand_value = sum(value_list)
+    @property
+    def is_blackjack(self):
+        return BLACKJACK[self._state] and not self.is_split
 
-        self._value = hand_value
+    @property
+    def is_bust(self):
+        return VALUES[self._state] > 21
+
+    @property
+    def state(self):
+        return self._state
 
     def add(self, cards):
         """Adds a card to the Hand and updates the value of the Hand"""
 
-        super().add(cards)
-        self._update_value()
+        # The same as Collection.add(), with the hand's state updated in the same loop. A single card (every
+        # hit) skips the loop.
+        if isinstance(cards, Card):
+            value = cards._value
+            self._cards.append(cards)
+            self._ranks[value] += 1
+            self._state = TRANSITIONS[self._state][value]
+            return
+        ranks = self._ranks
+        append = self._cards.append
+        state = self._state
+        for card in cards:
+            append(card)
+            value = card._value
+            ranks[value] += 1
+            state = TRANSITIONS[state][value]
+        self._state = state
+
+    def draw(self):
+        """Removes the first card from the Hand and updates the value of the Hand"""
+
+        card = super().draw()
+        self._state = hand_state(card._value for card in self._cards)  # value is None for facedown cards
+        return card
+
+    def discard(self):
+        """Removes all cards from the Hand. The value of an empty Hand is 0. The hand is no longer split, doubled,
+        or surrendered, and nothing is bet on it."""
+
+        # The same as Collection.discard(), written out since it is called for every hand of every round.
+        self._cards.clear()
+        self._ranks = [0] * 14
+        self._state = EMPTY
+        self.is_split = False
+        self.doubled = False
+        self.surrendered = False
+        self.bet = 0
 
 
 class Player():
@@ -116,17 +215,53 @@ class Player():
         name : str
             The name of the player.
 
+        bankroll : float
+            The money the player starts with. The default is 0, so the bankroll is the player's net winnings.
+
+        bet : float
+            The amount the player bets on every round, unless wager() is overridden. The default is 1.
+
     Data Attributes
     ---------------
+        bankroll : float
+            The player's money. The Game object adds what the player wins (or subtracts what they lose)
+            at the end of every round. It can go below zero, since the game doesn't stop a player
+            from betting more than they have.
+
+        bet : float
+            The player's usual bet.
+
+        counter : Counter or None
+            The card counting system of the deck the game is dealt from (see the counting module), or
+            None if the deck isn't counted. Set by the Game object when the cards are dealt, so
+            begin_turn() and decision() can read the running and true counts.
+
         had_turn : bool
             False if the player has not taken their turn. True if the player has taken their turn.
 
         hand : Hand
-            The player's blackjack hand.
+            The player's blackjack hand. After a split, this is the hand being played.
+
+        hands : list
+            Every hand the player holds. There is only one unless the player splits.
 
         name : str
             The player's name.
 
+        rules : Rules or None
+            The rules of the table (see the rules module). Set by the Game object when the cards are dealt
+            so decision() can check which actions are allowed.
+
+        unseen : tuple or None
+            The number of cards of each rank the player hasn't seen, indexed by rank like Collection.ranks:
+            the cards left in the deck and the dealer's facedown card. Worked out from the game's deck
+            each time it is read, so it is up to date at every decision. probability.rank_composition()
+            turns it into a composition. None until the player has played in a game.
+
+        upcard : Card or None
+            The dealer's faceup card. Set by the Game object when the cards are dealt so decision() can use it.
+            None between games.
+
     Methods
     -------
     begin_trun() :
@@ -142,21 +277,43 @@ class Player():
         Allows the player object to 'hit' or 'stay' in a game of blackjack.
         Returns True if the player chooses to 'hit'.
         Returns False if the player chooses to 'stay'.
+        Can also return one of the actions in the rules module (for example DOUBLE or SPLIT) if the
+        table's rules allow it. See Rules.actions().
+
+    wager() :
+        Called by the Game object before the cards are dealt.
+        Returns the amount the player bets on the round (bet, unless overridden). A player that counts
+        cards can override this to bet by the count.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, bankroll=0.0, bet=1):
 
         self.hand = Hand()
+        self.hands = [self.hand]
         self.had_turn = False
         self.name = name
+        self.upcard = None
+        self.counter = None
+        self.rules = None
+        self.bankroll = bankroll
+        self.bet = bet
+        self._unseen = None  # set by the Game object: returns the ranks of the cards the player hasn't seen
+
+    @property
+    def unseen(self):
+        return None if self._unseen is None else self._unseen()
 
     def clean_up(self) -> None:
         """Resets the player for a new game.
 
-        The method empties the player's hand and sets had_turn to False.
+        The method empties the player's hand (and drops any split hands), sets had_turn to False, and
+        forgets the dealer's upcard.
         """
+        self.hand = self.hands[0]
+        del self.hands[1:]
         self.hand.discard()
         self.had_turn = False
+        self.upcard = None
 
     def begin_turn(self):
         """Called by the game object at the begining of the Player's turn.
@@ -167,6 +324,11 @@ class Player():
     def decision(self):
         pass
 
+    def wager(self):
+        """Returns the amount the player bets on the next round. Called by the Game object before the cards are
+        dealt, so the count (if any) includes every card from the rounds before."""
+        return self.bet
+
 
 class HumanPlayer(Player):
     """Allows a human user to interact with a game of blackjack. Extends the Player class.
@@ -176,6 +338,12 @@ class HumanPlayer(Player):
         name : str
             The name of the human.
 
+        bankroll : float
+            The money the human starts with. The default is 0.
+
+        bet : float
+            The amount the human bets on every round. The default is 1.
+
     Data Attributes
     ---------------
         had_turn : bool
@@ -198,28 +366,92 @@ class HumanPlayer(Player):
         Returns None
 
     decision() :
-        Ask the human if they want to hit or stay.
+        Ask the human if they want to hit or stay, or take any other action the table's rules allow.
         Returns True if the human chooses to 'hit'.
         Returns False if the human chooses to 'stay'.
+        Returns the action (for example 'double') if the human chooses another action.
     """
 
-    def __init__(self, name):
-        super().__init__(name)
+    def __init__(self, name, bankroll=0.0, bet=1):
+        super().__init__(name, bankroll, bet)
 
-    def decision(self) -> bool:
+    def decision(self):
         """Defines a human player's turn.
-        Returns a bool to be handled by the game object.
+        Returns a bool (or one of the other actions the rules allow) to be handled by the game object.
         """
 
+        # 'stay' is what the human types for STAND.
+        actions = self.rules.actions(self.hand, len(self.hands)) if self.rules is not None else (HIT, STAND)
+        choices = ['stay' if action == STAND else action for action in actions]
+        options = ' or '.join(f'"{choice}"' for choice in choices)
+
         while True:
             # Get's user input, makes all charactures lowercase, and removes any whitespace
-            decision = input('Enter "hit" or "stay". \n').lower().strip()
+            decision = input(f'Enter {options}. \n').lower().strip()
 
             if decision == 'hit' or decision == 'stay':
                 return decision == 'hit'
+            elif decision in choices:
+                return decision
             else:
                 # Humans can be dumb. Doesn't break the while loop
-                print('\nYou must type "hit" or "stay".')
+                print(f'\nYou must type {options}.')
+
+
+class StrategyPlayer(Player):
+    """A computer player that plays by a strategy chart. Extends the Player class.
+
+    The chart is turned into a lookup table when the player is made, so each decision is a single
+    lookup by the state of the player's hand and the dealer's upcard.
+
+    Parameters
+    ----------
+        name : str
+            The name of the player.
+
+        chart : dict or None
+            The strategy chart to play by (see the strategy module). If None (the default), the player
+            uses basic strategy.
+
+        bankroll : float
+            The money the player starts with. The default is 0.
+
+        bet : float
+            The amount the player bets on every round, unless wager() is overridden. The default is 1.
+
+    Data Attributes
+    ---------------
+        chart : dict
+            The strategy chart the player plays by.
+
+        All other data attributes are the same as the Player class.
+
+    Methods
+    -------
+    from_file(name, path, bankroll=0.0, bet=1) :
+        Makes a player that plays by the chart in the file at path. This is a class method.
+        Returns StrategyPlayer
+
+    decision() :
+        Looks up the player's hand and the dealer's upcard in the chart.
+        Returns True if the chart says to 'hit'.
+        Returns False if the chart says to 'stay'.
+
+    All other methods are the same as the Player class.
+    """
+
+    def __init__(self, name, chart=None, bankroll=0.0, bet=1):
+        super().__init__(name, bankroll, bet)
+        self.chart = chart if chart is not None else BASIC_STRATEGY
+        self._hits = hit_table(self.chart)
+
+    @classmethod
+    def from_file(cls, name, path, bankroll=0.0, bet=1):
+        """Returns a player that plays by the chart in the file at path."""
+        return cls(name, load_chart(path), bankroll, bet)
+
+    def decision(self):
+        return self._hits[self.hand.state][self.upcard.value]
 
 
 class Dealer(Player):
@@ -227,7 +459,8 @@ class Dealer(Player):
 
     Parameters
     ----------
-        None
+        rules : Rules or None
+            The rules of the table. If None (the default), the dealer stands on all 17s.
 
     Data Attributes
     ---------------
@@ -252,15 +485,18 @@ class Dealer(Player):
 
     decision() :
         Determines if the dealer should hit or stay using the standard rules of blackjack
-        Returns True if the dealer hits (hand value of less than 17).
-        Returns False if the dealer stays (hand value of 17 or more).
+        Returns True if the dealer hits (hand value of less than 17, or a soft 17 if the rules say so).
+        Returns False if the dealer stays.
     """
 
-    def __init__(self):
+    def __init__(self, rules=None):
         super().__init__('The Dealer')
+        self.rules = rules
+        # The rule is looked up once here, so each decision is a single lookup.
+        self._hits = rules.dealer_hits if rules is not None else DEALER_HITS
 
     def begin_turn(self):
         self.hand.reveal()
 
     def decision(self):
-        return self.hand.value < 17  # Returns True for 'hit' or False for 'stay'
+        return self._hits[self.hand.state]  # Returns True for 'hit' or False for 'stay'
@@ -0,0 +1,299 @@
+"""This module calculates exact blackjack probabilities and expected values from the cards left in a shoe.
+
+The cards left in a shoe are described by a composition: a tuple of 10 counts, one for each number
+of points a card can be worth. composition[0] is the number of Aces, composition[1] the number of
+2s, ... and composition[9] the number of 10s, Jacks, Queens, and Kings together.
+
+Hands are played with the lookup tables from the tables module and the dealer follows the same
+table as Dealer.decision(). Results are memoized on (hand state, composition), so positions that
+can be reached in more than one way are only worked out once. The caches are bounded LRU caches.
+
+Expected values (EVs) are the average number of bets won per bet: 1.0 always wins, -1.0 always loses.
+The EV functions take a Rules object (see the rules module) for the dealer's soft 17 rule and whether
+ties push. Like a Game, the dealer peeks for blackjack before the player acts, so EVs against an Ace
+or a 10 are conditioned on the dealer not having blackjack. EVs are for hands that are played out by
+hitting and standing, so the player's own blackjacks, doubling, splitting, and surrender aren't included.
+
+Upcards can be given in points (1 for an Ace, 10 for a 10 or a face card) or as a card's rank, so
+Card.value can be passed straight in.
+
+The following functions are included in this module:
+    composition
+    rank_composition
+    shoe_composition
+    dealer_probabilities
+    dealer_table
+    blackjack_probability
+    stand_ev
+    hit_ev
+    should_hit
+"""
+
+from functools import lru_cache
+
+from .cards import Collection
+from .results import (
+    WIN,
+    LOSE,
+    BUST,
+    PUSH,
+    outcome)
+from .rules import Rules
+from .tables import (
+    TRANSITIONS,
+    VALUES,
+    POINTS,
+    EMPTY,
+    dealer_hits)
+
+# The dealer's final totals, in the order the probabilities are kept. 'bust' is anything over 21.
+DEALER_TOTALS = (17, 18, 19, 20, 21, 'bust')
+
+# The hand value each of DEALER_TOTALS stands for when deciding the outcome of a round.
+_DEALER_VALUES = (17, 18, 19, 20, 21, 22)
+
+# The number of bets won for each outcome. These are the same for every Rules object.
+PAYOFFS = {WIN: 1.0, LOSE: -1.0, BUST: -1.0, PUSH: 0.0}
+
+CACHE_SIZE = 2 ** 18
+
+_DEALER_HITS = {False: dealer_hits(), True: dealer_hits(hit_soft_17=True)}
+
+# The points of the hidden card that would give the dealer blackjack, for each upcard that can make one.
+_BLACKJACK_CARDS = {1: 10, 10: 1}
+
+_DEFAULT_RULES = Rules()
+
+
+def composition(cards):
+    """Returns the composition of an iterable of cards (for example, the cards left in a Deck).
+
+    Collections (including decks) already know how many cards of each rank they hold, so their
+    composition is read from their ranks without looking at the cards.
+    """
+    if isinstance(cards, Collection):
+        return rank_composition(cards.ranks)
+
+    counts = [0] * 10
+    for card in cards:
+        counts[min(card.value, 10) - 1] += 1
+    return tuple(counts)
+
+
+def rank_composition(ranks):
+    """Returns the composition of a count of cards by rank, indexed by rank like Collection.ranks and
+    Player.unseen (ranks[0] is unused)."""
+    ranks = tuple(ranks)
+    return ranks[1:10] + (sum(ranks[10:]),)
+
+
+def shoe_composition(decks=1):
+    """Returns the composition of a full shoe of standard decks."""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+def _remove(composition, points):
+    """Returns the composition with one card worth points taken out."""
+    index = points - 1
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+def _final(value):
+    """Returns the probabilities of a dealer who stands with value."""
+    final = [0.0] * 6
+    final[value - 17 if value <= 21 else 5] = 1.0
+    return tuple(final)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _dealer(state, composition, hit_soft_17, peeked=0):
+    """Returns the probabilities of each final total for a dealer holding state.
+
+    If peeked is the points of a card (not 0), the dealer's next card can't be worth that many points. The
+    paths where it is are left out rather than reweighted, so the probabilities add up to the chance that
+    the next card isn't worth peeked points.
+    """
+
+    if not _DEALER_HITS[hit_soft_17][state]:
+        return _final(VALUES[state])
+
+    total = sum(composition)
+    if total == 0:
+        raise ValueError('the shoe ran out of cards')
+
+    result = [0.0] * 6
+    transitions = TRANSITIONS[state]
+    for index, count in enumerate(composition):
+        if count and index + 1 != peeked:
+            chance = count / total
+            rest = composition[:index] + (count - 1,) + composition[index + 1:]
+            for final, probability in enumerate(_dealer(transitions[index + 1], rest, hit_soft_17)):
+                result[final] += chance * probability
+    return tuple(result)
+
+
+def _points(upcard):
+    """Returns the points of upcard, which can be in points or a card's rank."""
+    if not isinstance(upcard, int) or not 1 <= upcard <= 13:
+        raise ValueError(f'upcard must be a rank or number of points from 1 to 13, not {upcard!r}')
+    return POINTS[upcard]
+
+
+def _rules(rules):
+    """Returns rules, or the default Rules if rules is None."""
+    if rules is None:
+        return _DEFAULT_RULES
+    if not isinstance(rules, Rules):
+        raise TypeError(f'rules must be a Rules object, not a {type(rules).__name__}')
+    return rules
+
+
+def dealer_probabilities(upcard, composition, rules=None):
+    """Returns the probability of each of the dealer's final totals as a dict.
+
+    Parameters
+    ----------
+        upcard : int
+            The number of points of the dealer's faceup card (1 for an Ace), or its rank (11 to 13 for
+            face cards). Raises a ValueError if not 1 to 13.
+
+        composition : tuple
+            The cards left in the shoe, not counting the upcard. The dealer's hidden card is drawn from these.
+
+        rules : Rules or None
+            The rules the dealer plays by. If None (the default), Rules() is used.
+
+    The keys of the dict are 17, 18, 19, 20, 21, and 'bust'. Dealer blackjacks are counted as 21s.
+    """
+    probabilities = _dealer(TRANSITIONS[EMPTY][_points(upcard)], tuple(composition), _rules(rules).hit_soft_17)
+    return dict(zip(DEALER_TOTALS, probabilities))
+
+
+def dealer_table(composition=None, rules=None):
+    """Returns dealer_probabilities() for every upcard as a dict keyed by upcard (1 to 10).
+
+    composition is the cards left in the shoe before the upcard is dealt. If None (the default),
+    a full 6 deck shoe is used.
+    """
+    if composition is None:
+        composition = shoe_composition(6)
+
+    return {upcard: dealer_probabilities(upcard, _remove(tuple(composition), upcard), rules)
+            for upcard in range(1, 11) if composition[upcard - 1]}
+
+
+def _no_blackjack(peeked, composition):
+    """Returns the chance that the dealer's hidden card, drawn from composition, isn't worth peeked points."""
+
+    total = sum(composition)
+    if total == 0:
+        raise ValueError('the shoe ran out of cards')
+    if not peeked:
+        return 1.0
+    return 1.0 - composition[peeked - 1] / total
+
+
+def blackjack_probability(upcard, composition):
+    """Returns the chance that the dealer's hidden card gives them blackjack.
+
+    upcard and composition are the same as dealer_probabilities().
+    """
+    return 1.0 - _no_blackjack(_BLACKJACK_CARDS.get(_points(upcard), 0), tuple(composition))
+
+
+# The EVs below are worked out without reweighting for the dealer's peek: paths where the dealer has
+# blackjack are left out, so each EV is the average payoff times the chance the dealer doesn't have
+# blackjack. That chance only depends on the composition, so comparing hitting with standing is
+# unchanged, and the public functions divide it out once at the end.
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _stand(value, dealer_state, composition, hit_soft_17, push, peeked):
+    """Returns the EV of standing with value against a dealer holding dealer_state."""
+
+    if value > 21:
+        return PAYOFFS[BUST] * _no_blackjack(peeked, composition)
+
+    probabilities = _dealer(dealer_state, composition, hit_soft_17, peeked)
+    return sum(probability * PAYOFFS[outcome(value, dealer_value, push)]
+               for dealer_value, probability in zip(_DEALER_VALUES, probabilities))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _hit(state, dealer_state, composition, hit_soft_17, push, peeked):
+    """Returns the EV of hitting once with state and then making the best decision after that."""
+
+    total = sum(composition)
+    if total == 0:
+        raise ValueError('the shoe ran out of cards')
+
+    result = 0.0
+    transitions = TRANSITIONS[state]
+    for index, count in enumerate(composition):
+        if count:
+            rest = composition[:index] + (count - 1,) + composition[index + 1:]
+            new_state = transitions[index + 1]
+            value = VALUES[new_state]
+            if value > 21:
+                ev = PAYOFFS[BUST] * _no_blackjack(peeked, rest)
+            else:
+                ev = max(_stand(value, dealer_state, rest, hit_soft_17, push, peeked),
+                         _hit(new_state, dealer_state, rest, hit_soft_17, push, peeked))
+            result += count / total * ev
+    return result
+
+
+def _position(upcard, composition, rules):
+    """Returns the arguments of _stand() and _hit() after the hand, and the chance that the dealer
+    doesn't have blackjack."""
+
+    rules = _rules(rules)
+    upcard = _points(upcard)
+    composition = tuple(composition)
+    peeked = _BLACKJACK_CARDS.get(upcard, 0)
+    no_blackjack = _no_blackjack(peeked, composition)
+    if no_blackjack == 0:
+        raise ValueError('the dealer is certain to have blackjack')
+    return (TRANSITIONS[EMPTY][upcard], composition, rules.hit_soft_17, rules.push, peeked), no_blackjack
+
+
+def stand_ev(hand_state, upcard, composition, rules=None):
+    """Returns the EV of standing, given that the dealer doesn't have blackjack.
+
+    Parameters
+    ----------
+        hand_state : int
+            The state of the player's hand (Hand.state).
+
+        upcard : int
+            The number of points of the dealer's faceup card (1 for an Ace), or its rank (11 to 13 for
+            face cards). Raises a ValueError if not 1 to 13.
+
+        composition : tuple
+            The cards left in the shoe, not counting the player's cards or the upcard. The dealer's
+            hidden card is drawn from these. In a game, rank_composition(player.unseen) is the right one.
+
+        rules : Rules or None
+            The table's rules. The dealer's soft 17 rule and whether ties push are used. If None (the
+            default), Rules() is used.
+    """
+    arguments, no_blackjack = _position(upcard, composition, rules)
+    return _stand(VALUES[hand_state], *arguments) / no_blackjack
+
+
+def hit_ev(hand_state, upcard, composition, rules=None):
+    """Returns the EV of hitting once and then making the best decision after every card, given that
+    the dealer doesn't have blackjack.
+
+    The parameters are the same as stand_ev().
+    """
+    arguments, no_blackjack = _position(upcard, composition, rules)
+    return _hit(hand_state, *arguments) / no_blackjack
+
+
+def should_hit(hand, upcard, composition, rules=None):
+    """Returns True if hitting has a higher EV than standing. Meant to be called from Player.decision().
+
+    hand is a Hand. The other parameters are the same as stand_ev(). Positions worked out for
+    earlier decisions are remembered, so later decisions are usually much faster.
+    """
+    return hit_ev(hand.state, upcard, composition, rules) > stand_ev(hand.state, upcard, composition, rules)
@@ -0,0 +1,138 @@
+"""This module measures where a game spends its time.
+
+A Game given a Profiler times each phase of every round, times every decision each player makes,
+and counts rounds, cards drawn, and reshuffles. A game without a profiler doesn't look at the clock
+at all. The counters can be read at any time as a snapshot (a plain dict that can be saved as JSON),
+and a long simulation can hand the profiler a function to call with a snapshot every so many rounds.
+
+The following are included in this module:
+    PHASES : The phases of a round, in order.
+    Profiler : Times the phases of a game's rounds and its players' decisions.
+"""
+
+from time import perf_counter
+
+# 'players' includes every decision and card drawn during the players' turns. 'results' is printing
+# the results and recording the round to the game's history. Game.simulate() cleans up the players
+# while it settles their hands, so their clean up is counted in 'settle'.
+PHASES = ('shuffle', 'deal', 'players', 'dealer', 'settle', 'results', 'clean_up')
+
+
+class Profiler():
+    """Times the phases of a game's rounds and its players' decisions.
+
+    Give the profiler to a Game (Game(..., profiler=profiler) or game.profiler = profiler) and every
+    round the game plays, including rounds played by Game.simulate(), is measured.
+
+        Parameters
+        ----------
+            report : callable or None
+                Called with a snapshot every `every` rounds, for example to save the counters of a long
+                simulation as it runs. If None (the default), nothing is called.
+
+            every : int
+                The number of rounds between reports. The default is 100000.
+
+        Data Attributes
+        ---------------
+            rounds : int
+                The number of rounds measured.
+
+            cards_drawn : int
+                The number of cards drawn in those rounds.
+
+            reshuffles : int
+                The number of times the deck was reshuffled.
+
+            phases : dict
+                The total number of seconds spent in each phase (see PHASES).
+
+            decisions : dict
+                For each player's name, a dict with the number of decisions the player made ('count'),
+                the total number of seconds they took ('seconds'), and the longest one ('max'). The time
+                includes the game checking that the decision is allowed.
+
+        Methods
+        -------
+            snapshot() :
+                Returns a copy of every counter as a dict, with the average decision time of each player.
+
+            reset() :
+                Sets every counter back to zero.
+                Returns None
+
+        Other Behaviors
+        ---------------
+            String :
+                Passing a profiler into the str() method will return a summary of where the time went.
+    """
+
+    def __init__(self, report=None, every=100000):
+        if every < 1:
+            raise ValueError('every must be at least 1')
+
+        self.report = report
+        self.every = every
+        self._last = perf_counter()
+        self.reset()
+
+    def reset(self):
+        """Sets every counter back to zero."""
+        self.rounds = 0
+        self.cards_drawn = 0
+        self.reshuffles = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.decisions = {}
+
+    def start(self):
+        """Called by the Game object at the start of a round. The first phase is timed from here."""
+        self._last = perf_counter()
+
+    def mark(self, phase):
+        """Called by the Game object at the end of each phase. Adds the time since the last mark to phase."""
+        now = perf_counter()
+        self.phases[phase] += now - self._last
+        self._last = now
+
+    def decision(self, name, seconds):
+        """Called by the Game object after every decision. Counts a decision by the player called name."""
+        try:
+            stats = self.decisions[name]
+        except KeyError:
+            stats = self.decisions[name] = {'count': 0, 'seconds': 0.0, 'max': 0.0}
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        if seconds > stats['max']:
+            stats['max'] = seconds
+
+    def end_round(self, cards_drawn):
+        """Called by the Game object at the end of a round. Calls report every `every` rounds."""
+        self.rounds += 1
+        self.cards_drawn += cards_drawn
+        if self.report is not None and self.rounds % self.every == 0:
+            self.report(self.snapshot())
+
+    def snapshot(self):
+        """Returns a copy of every counter as a dict that can be saved as JSON."""
+        decisions = {}
+        for name, stats in self.decisions.items():
+            decisions[name] = dict(stats, mean=stats['seconds'] / stats['count'])
+        return {
+            'rounds': self.rounds,
+            'cards_drawn': self.cards_drawn,
+            'reshuffles': self.reshuffles,
+            'phases': dict(self.phases),
+            'decisions': decisions,
+        }
+
+    def __str__(self):
+        total = sum(self.phases.values())
+        string_ = f'{self.rounds} rounds, {self.cards_drawn} cards drawn, {self.reshuffles} reshuffles\n'
+        for phase, seconds in self.phases.items():
+            share = seconds / total if total else 0.0
+            string_ += f'{phase:<10} {seconds:10.4f} s {share:7.1%}\n'
+        for name, stats in self.decisions.items():
+            string_ += (f"{name}: {stats['count']} decisions, "
+                        f"{stats['seconds'] / stats['count'] * 1e6:.2f} us on average, "
+                        f"{stats['max'] * 1e6:.2f} us at most\n")
+        return string_
@@ -0,0 +1,161 @@
+"""This module defines objects for collecting the outcomes of games of blackjack.
+
+The following classes are included in this module:
+    PlayerResult
+    RoundResult
+    Tally
+"""
+
+from collections import namedtuple
+
+# The possible outcomes of a round for a player. Strings are used so results are easy to read.
+WIN = 'win'
+LOSE = 'lose'
+BUST = 'bust'
+PUSH = 'push'
+BLACKJACK = 'blackjack'
+SURRENDER = 'surrender'
+
+OUTCOMES = (WIN, LOSE, BUST, PUSH, BLACKJACK, SURRENDER)
+
+# How each outcome is described in a tally. The first three are always shown.
+_PLURALS = {WIN: 'wins', LOSE: 'losses', BUST: 'busts', PUSH: 'pushes',
+            BLACKJACK: 'blackjacks', SURRENDER: 'surrenders'}
+
+
+def outcome(player_score, dealer_score, push=True):
+    """Returns the outcome of a round for a player with player_score against a dealer with dealer_score.
+
+    If push is True (the default), a tie is a push. If push is False, the player wins ties.
+    Blackjacks and surrenders depend on more than the scores and are settled by the Rules class.
+    """
+    if player_score > 21:
+        return BUST
+    elif player_score < dealer_score <= 21:
+        return LOSE
+    elif push and player_score == dealer_score:
+        return PUSH
+    else:
+        return WIN
+
+
+# Results only hold ints and strings (never Card objects), so millions of them can be kept cheaply.
+PlayerResult = namedtuple('PlayerResult', ['name', 'value', 'outcome', 'hits', 'seat', 'payoff', 'wager'])
+PlayerResult.__doc__ = """The result of one round for one of a player's hands: name, final hand value, outcome,
+number of hits, the player's seat, the amount the hand won (negative if it lost), and the amount wagered on
+the hand (counting a double down)."""
+
+RoundResult = namedtuple('RoundResult', ['players', 'dealer_value', 'cards_drawn'])
+RoundResult.__doc__ = """The result of one round: a tuple of PlayerResults (in seat order, one for each hand a
+player held after splitting), the dealer's final hand value, and the total number of cards drawn from the
+deck during the round."""
+
+
+class Tally():
+    """The combined outcomes of many rounds of blackjack.
+
+    Parameters
+    ----------
+        names : iterable of str
+            The names of the players in the game, in seat order.
+
+    Data Attributes
+    ---------------
+        names : tuple
+            The names of the players in the game, in seat order.
+
+        outcomes : list
+            One dict per seat counting how many times the player had each outcome ('win', 'lose', 'bust',
+            'push', 'blackjack', or 'surrender'). A player who splits has an outcome for every hand.
+
+        hits : list
+            The total number of hits taken by the player in each seat.
+
+        won : list
+            The total amount won by the player in each seat (negative if the player lost money).
+
+        wagered : list
+            The total amount wagered by the player in each seat, counting double downs and split hands.
+
+        cards_drawn : int
+            The total number of cards drawn from the deck.
+
+        rounds : int
+            The number of rounds counted by the tally.
+
+    Methods
+    -------
+        add(result) :
+            Counts a RoundResult in the tally.
+            Returns None
+
+        record(seat, outcome, hits=0, payoff=0.0, wager=0.0) :
+            Counts one outcome for the player in the given seat, the amount it won, and the amount wagered.
+            Returns None
+
+        edge(seat=0) :
+            Returns the house edge against the player in the given seat: the fraction of the money
+            wagered that the house kept (negative if the player came out ahead).
+
+    Other Behaviors
+    ---------------
+        Addition :
+            Two tallies for the same players can be added with the '+' operator. This returns a new tally.
+
+        String :
+            Passing a tally into the str() method will return a summary of the outcomes for every player.
+    """
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.outcomes = [dict.fromkeys(OUTCOMES, 0) for _ in self.names]
+        self.hits = [0 for _ in self.names]
+        self.won = [0.0 for _ in self.names]
+        self.wagered = [0.0 for _ in self.names]
+        self.cards_drawn = 0
+        self.rounds = 0
+
+    def add(self, result):
+        """Counts a RoundResult in the tally."""
+        for player in result.players:
+            self.record(player.seat, player.outcome, player.hits, player.payoff, player.wager)
+        self.cards_drawn += result.cards_drawn
+        self.rounds += 1
+
+    def record(self, seat, outcome, hits=0, payoff=0.0, wager=0.0):
+        """Counts one outcome for the player in the given seat, the amount it won, and the amount wagered."""
+        self.outcomes[seat][outcome] += 1
+        self.hits[seat] += hits
+        self.won[seat] += payoff
+        self.wagered[seat] += wager
+
+    def edge(self, seat=0):
+        """Returns the fraction of the money wagered by the player in the given seat that the house kept."""
+        if not self.wagered[seat]:
+            raise ValueError(f'{self.names[seat]} has not wagered anything')
+        return -self.won[seat] / self.wagered[seat]
+
+    def __add__(self, other):
+        if type(other) is not type(self):
+            raise TypeError(
+                f'can only add {type(self).__name__} (not {type(other).__name__}) to {type(self).__name__}')
+        if other.names != self.names:
+            raise ValueError('can only add tallies for the same players')
+
+        total = type(self)(self.names)
+        total.rounds = self.rounds + other.rounds
+        total.cards_drawn = self.cards_drawn + other.cards_drawn
+        total.hits = [a + b for a, b in zip(self.hits, other.hits)]
+        total.won = [a + b for a, b in zip(self.won, other.won)]
+        total.wagered = [a + b for a, b in zip(self.wagered, other.wagered)]
+        for seat, counts in enumerate(total.outcomes):
+            for key in counts:
+                counts[key] = self.outcomes[seat][key] + other.outcomes[seat][key]
+        return total
+
+    def __str__(self):
+        string_ = f'{self.rounds} rounds\n'
+        for name, counts in zip(self.names, self.outcomes):
+            shown = [key for key in OUTCOMES if key in (WIN, LOSE, BUST) or counts[key]]
+            string_ += f"{name}: " + ', '.join(f'{counts[key]} {_PLURALS[key]}' for key in shown) + '\n'
+        return string_
@@ -0,0 +1,240 @@
+"""This module defines the rules of a blackjack table.
+
+A Rules object describes one table's house rules: whether the dealer hits a soft 17, what a
+blackjack pays, and when players can double down, split, and surrender. Every rule that depends
+on a hand is worked out for every hand state (see the tables module) when the rules are made, so
+checking a rule during a game is a single lookup.
+
+Players answer decision() with True (hit), False (stand), or one of the actions below.
+
+The following are included in this module:
+    Rules : The rules of a blackjack table.
+    HIT, STAND, DOUBLE, SPLIT, SURRENDER : The actions a player can take.
+    ACTIONS : Every action, in the order above.
+"""
+
+from .results import (
+    WIN,
+    LOSE,
+    BUST,
+    PUSH,
+    BLACKJACK,
+    SURRENDER as SURRENDERED,
+    outcome)
+from .tables import (
+    VALUES,
+    PAIR,
+    MAX_HARD,
+    describe,
+    dealer_hits)
+
+HIT = 'hit'
+STAND = 'stand'
+DOUBLE = 'double'
+SPLIT = 'split'
+SURRENDER = 'surrender'
+
+ACTIONS = (HIT, STAND, DOUBLE, SPLIT, SURRENDER)
+
+
+class Rules():
+    """The house rules of a blackjack table.
+
+    The defaults are common casino rules: the dealer stands on all 17s, blackjack pays 3:2, players
+    can double on any two cards (including after a split) and split up to four hands, split Aces
+    get one card each, there is no surrender, and ties are a push.
+
+        Parameters
+        ----------
+            hit_soft_17 : bool
+                If True, the dealer hits a soft 17. If False (the default), the dealer stands on all 17s.
+
+            blackjack_pays : float
+                The number of bets a player's blackjack wins. 1.5 (the default) is 3:2 and 1.2 is 6:5.
+
+            double : bool
+                If True (the default), players can double down on their first two cards.
+
+            double_on : iterable of int or None
+                The hand values players can double down on, for example (9, 10, 11). If None (the
+                default), players can double on any two cards.
+
+            double_after_split : bool
+                If True (the default), players can double down on hands made by splitting.
+
+            max_hands : int
+                The number of hands a player can split into. 1 turns off splitting. The default is 4.
+
+            resplit_aces : bool
+                If True, Aces can be split again when a split Ace is dealt another Ace. The default is False.
+
+            hit_split_aces : bool
+                If True, players can keep playing hands made by splitting Aces. If False (the default),
+                each split Ace gets one more card and the hand is over.
+
+            surrender : bool
+                If True, players can surrender their first two cards for half their bet (late surrender).
+                The default is False.
+
+            push : bool
+                If True (the default), a tie is a push and the player gets their bet back. If False,
+                the player wins ties.
+
+        Data Attributes
+        ---------------
+            Every parameter is also a read-only data attribute.
+
+            dealer_hits : tuple
+                dealer_hits[state] is True if the dealer hits a hand in state.
+
+            payoffs : dict
+                The number of bets won for each outcome (see the results module). Losing outcomes are negative.
+
+        Methods
+        -------
+            actions(hand, n_hands=1) :
+                Returns a tuple of the actions a player can take with hand, when the player holds n_hands hands.
+
+            settle(hand, dealer_hand) :
+                Returns (outcome, payoff): the outcome of hand against the dealer's hand and the number
+                of bets it won (negative if it lost).
+
+        Notes
+        -----
+            The dealer checks for blackjack before the players take their turns. If the dealer has
+            blackjack, the round is over and only a player blackjack ties it.
+    """
+
+    def __init__(self, hit_soft_17=False, blackjack_pays=1.5, double=True, double_on=None, double_after_split=True,
+                 max_hands=4, resplit_aces=False, hit_split_aces=False, surrender=False, push=True):
+
+        if max_hands < 1:
+            raise ValueError('max_hands must be at least 1')
+        if blackjack_pays <= 0:
+            raise ValueError('a blackjack must pay more than nothing')
+
+        self._hit_soft_17 = bool(hit_soft_17)
+        self._blackjack_pays = blackjack_pays
+        self._double = bool(double)
+        self._double_on = None if double_on is None else frozenset(double_on)
+        self._double_after_split = bool(double_after_split)
+        self._max_hands = max_hands
+        self._resplit_aces = bool(resplit_aces)
+        self._hit_split_aces = bool(hit_split_aces)
+        self._surrender = bool(surrender)
+        self._push = bool(push)
+
+        self._dealer_hits = dealer_hits(self._hit_soft_17)
+        self._payoffs = {WIN: 1.0, LOSE: -1.0, BUST: -1.0, PUSH: 0.0,
+                         BLACKJACK: float(blackjack_pays), SURRENDERED: -0.5}
+
+        # Everything below depends only on the hand's state, so it is worked out once for every state.
+        two_cards = [describe(state)[2] == 2 for state in range(len(VALUES))]
+        self._can_double = tuple(
+            self._double and is_two_cards and (self._double_on is None or value in self._double_on)
+            for is_two_cards, value in zip(two_cards, VALUES))
+        self._can_split = tuple(max_hands > 1 and pair for pair in PAIR)
+        self._can_surrender = tuple(self._surrender and is_two_cards for is_two_cards in two_cards)
+
+        # _outcomes[player value][dealer value], for every value a hand can have.
+        self._outcomes = tuple(tuple(outcome(player, dealer, self._push) for dealer in range(MAX_HARD + 1))
+                               for player in range(MAX_HARD + 1))
+
+    @property
+    def hit_soft_17(self):
+        return self._hit_soft_17
+
+    @property
+    def blackjack_pays(self):
+        return self._blackjack_pays
+
+    @property
+    def double(self):
+        return self._double
+
+    @property
+    def double_on(self):
+        return self._double_on
+
+    @property
+    def double_after_split(self):
+        return self._double_after_split
+
+    @property
+    def max_hands(self):
+        return self._max_hands
+
+    @property
+    def resplit_aces(self):
+        return self._resplit_aces
+
+    @property
+    def hit_split_aces(self):
+        return self._hit_split_aces
+
+    @property
+    def surrender(self):
+        return self._surrender
+
+    @property
+    def push(self):
+        return self._push
+
+    @property
+    def dealer_hits(self):
+        return self._dealer_hits
+
+    @property
+    def payoffs(self):
+        return dict(self._payoffs)
+
+    def actions(self, hand, n_hands=1):
+        """Returns a tuple of the actions a player can take with hand.
+
+        n_hands is the number of hands the player holds, which limits splitting. Hitting and standing
+        are always allowed, except on split Aces when hit_split_aces is False.
+        """
+
+        state = hand.state
+        split_aces = hand.is_split and hand[0].value == 1
+        can_split = self._can_split[state] and n_hands < self._max_hands and (not split_aces or self._resplit_aces)
+
+        if split_aces and not self._hit_split_aces:
+            # A split Ace only gets one more card, unless that card is another Ace that can be split again.
+            return (STAND, SPLIT) if can_split else (STAND,)
+
+        actions = [HIT, STAND]
+        if self._can_double[state] and (not hand.is_split or self._double_after_split):
+            actions.append(DOUBLE)
+        if can_split:
+            actions.append(SPLIT)
+        if self._can_surrender[state] and not hand.is_split:
+            actions.append(SURRENDER)
+        return tuple(actions)
+
+    def settle(self, hand, dealer_hand):
+        """Returns (outcome, payoff) for hand against the dealer's hand.
+
+        payoff is the number of bets the hand won, counting a doubled hand as two bets.
+        """
+
+        if hand.surrendered:
+            return SURRENDERED, self._payoffs[SURRENDERED]
+
+        player_blackjack = hand.is_blackjack
+        dealer_blackjack = dealer_hand.is_blackjack
+        if player_blackjack and not dealer_blackjack:
+            result = BLACKJACK
+        elif dealer_blackjack and not player_blackjack:
+            result = LOSE
+        else:
+            result = self._outcomes[hand.value][dealer_hand.value]
+
+        payoff = self._payoffs[result]
+        return result, payoff * 2 if hand.doubled else payoff
+
+    def __repr__(self):
+        return (f'{type(self).__name__}(hit_soft_17={self._hit_soft_17}, blackjack_pays={self._blackjack_pays}, '
+                f'double={self._double}, double_on={self._double_on}, double_after_split={self._double_after_split}, '
+                f'max_hands={self._max_hands}, resplit_aces={self._resplit_aces}, '
+                f'hit_split_aces={self._hit_split_aces}, surrender={self._surrender}, push={self._push})')
@@ -0,0 +1,370 @@
+"""This module serves blackjack tables to remote players over a local TCP socket.
+
+Players connect with a plain socket and play by exchanging JSON messages, one message per line. One
+asyncio event loop handles every connection and every table (see the asynchronous module), so a
+slow player only holds up their own table. The server only talks to a player when it needs a
+decision and once at the end of each round, when everything that happened in the round (every card
+drawn, every hand's outcome, and the player's bankroll) is sent in a single message.
+
+The module can be run as a script:
+
+    python3 -m blackjack.server --port 8765 --seats 1
+
+The Protocol
+------------
+Every message is a JSON object on its own line. A player starts by sending a hello:
+
+    {"name": "Bot", "bet": 1}
+
+The bet is optional (the default is 1) and is the player's bet on every round. The player waits
+in the lobby until the table has a player for every seat, and then the server sends:
+
+    {"type": "welcome", "seat": 0, "names": ["Bot"], "decks": 6}
+
+Whenever one of the player's hands needs a decision, the server sends
+
+    {"type": "decision", "id": 7, "hand": 0, "cards": [10, 6], "value": 16, "soft": false,
+     "upcard": 9, "actions": ["hit", "stand", "double"]}
+
+and the player answers with one of the actions, quoting the id:
+
+    {"id": 7, "action": "hit"}
+
+Cards are sent as their ranks (1 is an Ace and 11 to 13 are face cards). A player who takes longer
+than the server's timeout stands, and their late answer is ignored. An answer that isn't one of the
+actions gets an error message, and the server waits for another answer. At the end of each round,
+every player at the table is sent:
+
+    {"type": "result", "round": 1, "shuffled": true, "cards": [10, 6, 5, 9, 2, 10], "dealer_value": 19,
+     "hands": [{"seat": 0, "name": "Bot", "value": 18, "outcome": "lose", "payoff": -1, "wager": 1}],
+     "bankroll": -1}
+
+The cards are every card drawn in the round in the order they were dealt, including the dealer's
+facedown card, so a player can count cards. shuffled is true if the shoe was shuffled before the round.
+A player leaves by sending {"type": "quit"} or closing the connection. The table closes at the end of
+the round, and the other players at the table go back to the lobby.
+
+The following are included in this module:
+    RemotePlayer : A player at the other end of a connection.
+    TableServer : Serves blackjack tables to players that connect to it.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+from .asynchronous import (
+    AsyncGame,
+    AsyncPlayer)
+from .cards import Shoe
+from .rules import STAND
+
+# Messages are sent without spaces, so each one is as short as it can be.
+_SEPARATORS = (',', ':')
+
+
+class RemotePlayer(AsyncPlayer):
+    """A player at the other end of a connection. Extends the AsyncPlayer class.
+
+    Made by the TableServer object when a player says hello. Every line the player sends is read as
+    soon as it arrives, so the server notices straight away when the player leaves.
+
+    Parameters
+    ----------
+        name : str
+            The name of the player.
+
+        reader : asyncio.StreamReader
+            The connection's reader.
+
+        writer : asyncio.StreamWriter
+            The connection's writer.
+
+        bet : float
+            The amount the player bets on every round. The default is 1.
+
+    Data Attributes
+    ---------------
+        connected : bool
+            True until the player quits or the connection is lost.
+
+        All other data attributes are the same as the Player class.
+
+    Methods
+    -------
+    send(message) :
+        Sends a message (a dict) to the player. Call flush() to wait until it has been sent.
+        Returns None
+
+    flush() :
+        A coroutine that waits until everything sent to the player has been sent.
+
+    close() :
+        Closes the connection.
+        Returns None
+
+    decision() :
+        A coroutine. Asks the player for a decision and returns their answer. A player who has left stands.
+
+    All other methods are the same as the AsyncPlayer class.
+    """
+
+    def __init__(self, name, reader, writer, bet=1):
+        super().__init__(name, bet=bet)
+        self.connected = True
+        self._writer = writer
+        self._answers = asyncio.Queue()
+        self._id = 0
+        self._reading = asyncio.ensure_future(self._read(reader))
+
+    async def _read(self, reader):
+        """Reads the player's messages onto the queue of answers until they leave."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    self.send({'type': 'error', 'message': 'every message must be a JSON object'})
+                    continue
+                if not isinstance(message, dict):
+                    self.send({'type': 'error', 'message': 'every message must be a JSON object'})
+                elif message.get('type') == 'quit':
+                    break
+                else:
+                    self._answers.put_nowait(message)
+        except ConnectionError:
+            pass
+        finally:
+            self.connected = False
+            self._answers.put_nowait(None)  # wakes up a decision waiting for an answer
+
+    def send(self, message):
+        if self.connected:
+            self._writer.write(json.dumps(message, separators=_SEPARATORS).encode() + b'\n')
+
+    async def flush(self):
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            self.connected = False
+
+    def close(self):
+        self.connected = False
+        self._reading.cancel()
+        self._writer.close()
+
+    async def decision(self):
+        if not self.connected:
+            return STAND
+
+        self._id += 1
+        hand = self.hand
+        actions = self.rules.actions(hand, len(self.hands))
+        self.send({'type': 'decision', 'id': self._id, 'hand': self.hands.index(hand),
+                   'cards': [card.value for card in hand], 'value': hand.value, 'soft': hand.is_soft,
+                   'upcard': self.upcard.value, 'actions': list(actions)})
+        await self.flush()
+
+        while True:
+            answer = await self._answers.get()
+            if answer is None:
+                return STAND
+            if answer.get('id') != self._id:
+                continue  # an answer to a decision that ran out of time
+            action = answer.get('action')
+            if action in actions:
+                return action
+            self.send({'type': 'error', 'id': self._id,
+                       'message': f"the action must be one of {', '.join(actions)}, not {action!r}"})
+            await self.flush()
+
+
+class TableServer():
+    """Serves blackjack tables to players that connect to it. See the module docstring for the protocol.
+
+    Parameters
+    ----------
+        host : str
+            The address to listen on. The default is '127.0.0.1', so only this computer can connect.
+
+        port : int
+            The port to listen on. If 0 (the default), the operating system picks a free port.
+
+        seats : int
+            The number of players at each table. A table starts as soon as it is full. The default is 1,
+            so every player gets a table of their own.
+
+        decks : int
+            The number of decks in each table's shoe. The default is 6.
+
+        rules : Rules or None
+            The rules of every table. If None (the default), the tables use Rules().
+
+        timeout : float or None
+            The number of seconds a player has to make each decision. A player who takes longer stands.
+            If None (the default), players can take as long as they like.
+
+        seed : int or None
+            Seeds the shoes of the tables, one after another, so the same players connecting in the same
+            order are dealt the same cards. If None (the default), the cards are not reproducible.
+
+    Data Attributes
+    ---------------
+        port : int
+            The port the server is listening on, once it has started.
+
+        tables : int
+            The number of tables being played.
+
+        rounds : int
+            The total number of rounds played, added up over all the tables.
+
+    Methods
+    -------
+        start() :
+            A coroutine that starts listening for players.
+
+        serve_forever() :
+            A coroutine that starts listening (if needed) and serves players until it is cancelled.
+
+        close() :
+            A coroutine that stops listening, closes every table, and disconnects every player.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, seats=1, decks=6, rules=None, timeout=None, seed=None):
+        if seats < 1:
+            raise ValueError('a table must have at least one seat')
+
+        self.host = host
+        self.port = port
+        self.seats = seats
+        self.decks = decks
+        self.rules = rules
+        self.timeout = timeout
+        self.tables = 0
+        self.rounds = 0
+        self._seeder = random.Random(seed) if seed is not None else None
+        self._lobby = []
+        self._games = set()
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._connect, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for game in list(self._games):
+            game.cancel()
+        await asyncio.gather(*self._games, return_exceptions=True)
+        for player in self._lobby:
+            player.close()
+        self._lobby.clear()
+
+    async def _connect(self, reader, writer):
+        """Called for every new connection. Reads the player's hello and seats them in the lobby."""
+        try:
+            hello = json.loads(await reader.readline())
+            name = str(hello['name'])
+            bet = hello.get('bet', 1)
+            if isinstance(bet, bool) or not isinstance(bet, (int, float)) or bet <= 0:
+                raise ValueError('the bet must be a number more than 0')
+        except (ValueError, TypeError, KeyError) as error:
+            message = {'type': 'error', 'message': f'the first message must be a hello like '
+                                                   f'{{"name": "Bot", "bet": 1}} ({error})'}
+            writer.write(json.dumps(message, separators=_SEPARATORS).encode() + b'\n')
+            writer.close()
+            return
+        except ConnectionError:
+            writer.close()
+            return
+        self._seat(RemotePlayer(name, reader, writer, bet))
+
+    def _seat(self, player):
+        """Adds a player to the lobby, and starts a table once the lobby has enough players for one."""
+        self._lobby = [waiting for waiting in self._lobby if waiting.connected]
+        self._lobby.append(player)
+        if len(self._lobby) >= self.seats:
+            players, self._lobby = self._lobby[:self.seats], self._lobby[self.seats:]
+            game = asyncio.ensure_future(self._play(players))
+            self._games.add(game)
+            game.add_done_callback(self._games.discard)
+
+    async def _play(self, players):
+        """Plays rounds at a table until one of its players leaves."""
+        rng = self._seeder.getrandbits(64) if self._seeder is not None else None
+        deck = Shoe(self.decks, rng=rng)
+        game = AsyncGame(*players, summary=False, deck=deck, rules=self.rules, timeout=self.timeout)
+        names = [player.name for player in players]
+        for seat, player in enumerate(players):
+            player.send({'type': 'welcome', 'seat': seat, 'names': names, 'decks': self.decks})
+
+        self.tables += 1
+        try:
+            n_rounds = 0
+            while all(player.connected for player in players):
+                result = await game()
+                n_rounds += 1
+                self.rounds += 1
+                start = deck.drawn - result.cards_drawn
+                message = {
+                    'type': 'result',
+                    'round': n_rounds,
+                    'shuffled': start == 0,
+                    'cards': [card.value for card in deck.drawn_cards(start)],
+                    'dealer_value': result.dealer_value,
+                    'hands': [{'seat': hand.seat, 'name': hand.name, 'value': hand.value, 'outcome': hand.outcome,
+                               'payoff': hand.payoff, 'wager': hand.wager} for hand in result.players],
+                }
+                for player in players:
+                    player.send(dict(message, bankroll=player.bankroll))
+                await asyncio.gather(*(player.flush() for player in players))
+        finally:
+            self.tables -= 1
+            for player in players:
+                if player.connected and self._server is not None:
+                    self._seat(player)
+                else:
+                    player.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serves blackjack tables to remote players.')
+    parser.add_argument('--host', default='127.0.0.1', help='the address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='the port to listen on (default 8765)')
+    parser.add_argument('--seats', type=int, default=1, help='players at each table (default 1)')
+    parser.add_argument('--decks', type=int, default=6, help='decks in each shoe (default 6)')
+    parser.add_argument('--timeout', type=float, help='seconds each player has to decide (default: no limit)')
+    parser.add_argument('--seed', type=int, help='seeds the shoes, so the cards can be reproduced')
+    args = parser.parse_args()
+
+    server = TableServer(args.host, args.port, args.seats, args.decks, timeout=args.timeout, seed=args.seed)
+
+    async def serve():
+        await server.start()
+        print(f'Serving blackjack tables on {args.host}:{server.port}')
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
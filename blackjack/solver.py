@@ -0,0 +1,128 @@
+"""This module works out basic strategy for the game's rules from exact expected values.
+
+For every cell of a strategy chart (hand total, soft or hard, dealer upcard), the solver averages the
+EV of hitting and the EV of standing over every two card hand with that total, weighted by how likely
+each hand is to be dealt from the shoe. Cells that can't be made with two cards (hard 21) use three
+card hands. The action with the higher average EV goes in the chart. Like a Game, the dealer peeks for
+blackjack, so against an Ace or a 10 the hands are weighted by how likely they are when the dealer
+doesn't have blackjack.
+
+The module can be run as a script to write a chart file that StrategyPlayer.from_file() can load:
+
+    python3 -m blackjack.solver --decks 6 --output chart.txt
+
+The following functions are included in this module:
+    solve
+"""
+
+import argparse
+import time
+from itertools import combinations_with_replacement
+
+from . import probability
+from .rules import Rules
+from .strategy import (
+    UPCARDS,
+    HIT,
+    STAND,
+    save_chart,
+    format_chart)
+from .tables import (
+    VALUES,
+    SOFT,
+    hand_state)
+
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+
+
+def _hands(total, soft, n_cards):
+    """Returns every hand of n_cards cards (as points) worth total, in sorted order."""
+    return [hand for hand in combinations_with_replacement(range(1, 11), n_cards)
+            if VALUES[hand_state(hand)] == total and SOFT[hand_state(hand)] == soft]
+
+
+def _chance(hand, composition):
+    """Returns the chance of drawing the cards in hand from composition, and the composition left after."""
+    chance = 1.0
+    counts = list(composition)
+    for points in hand:
+        chance *= counts[points - 1] / sum(counts)
+        counts[points - 1] -= 1
+    return chance, tuple(counts)
+
+
+def _cell(total, soft, upcard, composition, rules):
+    """Returns the average EVs of hitting and standing for one cell of the chart."""
+
+    hands = _hands(total, soft, 2) or _hands(total, soft, 3)
+    weight = hit = stand = 0.0
+    for hand in hands:
+        chance, rest = _chance(hand, composition)
+        if chance == 0 or probability.blackjack_probability(upcard, rest) == 1:
+            continue
+        chance *= 1 - probability.blackjack_probability(upcard, rest)
+        state = hand_state(hand)
+        weight += chance
+        hit += chance * probability.hit_ev(state, upcard, rest, rules)
+        stand += chance * probability.stand_ev(state, upcard, rest, rules)
+    return hit / weight, stand / weight
+
+
+def solve(decks=6, rules=None):
+    """Works out the best hit/stand action for every cell of a strategy chart.
+
+    Parameters
+    ----------
+        decks : int
+            The number of decks in the shoe.
+
+        rules : Rules or None
+            The table's rules. The dealer's soft 17 rule and whether ties push are used. If None (the
+            default), Rules() is used.
+
+    Returns (chart, times), where chart is a strategy chart (see the strategy module) and times is a
+    dict mapping each cell (total, soft, upcard) to the number of seconds it took to solve.
+    """
+
+    shoe = probability.shoe_composition(decks)
+    chart = {}
+    times = {}
+    rows = [(total, False) for total in HARD_TOTALS] + [(total, True) for total in SOFT_TOTALS]
+
+    for total, soft in rows:
+        actions = ''
+        for upcard in UPCARDS:
+            start = time.perf_counter()
+            _, composition = _chance((upcard,), shoe)
+            hit, stand = _cell(total, soft, upcard, composition, rules)
+            actions += HIT if hit > stand else STAND
+            times[total, soft, upcard] = time.perf_counter() - start
+        chart[total, soft] = actions
+
+    return chart, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Works out basic strategy and writes it as a chart.')
+    parser.add_argument('--decks', type=int, default=6, help='the number of decks in the shoe (default 6)')
+    parser.add_argument('--hit-soft-17', action='store_true', help='the dealer hits a soft 17')
+    parser.add_argument('--no-push', action='store_true', help='the player wins ties instead of pushing')
+    parser.add_argument('--output', help='the file to write the chart to (default: print the chart)')
+    args = parser.parse_args()
+
+    chart, times = solve(args.decks, Rules(hit_soft_17=args.hit_soft_17, push=not args.no_push))
+
+    for (total, soft, upcard), seconds in times.items():
+        kind = 'soft' if soft else 'hard'
+        print(f'{kind} {total:>2} vs {upcard:>2}: {seconds * 1000:8.1f} ms')
+    print(f'total: {sum(times.values()):.2f} s, slowest cell: {max(times.values()) * 1000:.1f} ms\n')
+
+    if args.output:
+        save_chart(chart, args.output)
+    else:
+        print(format_chart(chart))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""This module defines blackjack strategy charts and how they are read and written.
+
+A chart says what a player should do for every hand total against every dealer upcard. In Python a
+chart is a dict mapping (total, soft) to a string with one letter per dealer upcard, in the order
+2 3 4 5 6 7 8 9 10 A. 'H' is hit and 'S' is stand. Rows missing from a chart are stands.
+
+Charts are stored in a compact text format with one row per line:
+
+    # comments start with #
+    #         23456789TA
+    hard 16   SSSSSHHHHH
+    soft 18   SSSSSSSHHH
+
+The following are included in this module:
+    BASIC_STRATEGY : The standard hit/stand basic strategy chart.
+    UPCARDS : The dealer upcards (in points, 1 for an Ace) in the order of a chart's columns.
+    parse_chart(text) : Returns the chart described by text.
+    format_chart(chart) : Returns chart as text.
+    load_chart(path) : Reads a chart from a file.
+    save_chart(chart, path) : Writes a chart to a file.
+    hit_table(chart) : Returns a table for looking up a chart's decisions by hand state and upcard rank.
+"""
+
+from .tables import (
+    VALUES,
+    SOFT,
+    POINTS)
+
+# Dealer upcards in points, in the order of a chart's columns. An Ace is worth 1 point.
+UPCARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 1)
+
+HIT = 'H'
+STAND = 'S'
+
+_HEADER = '#         23456789TA\n'
+
+
+def parse_chart(text):
+    """Returns the chart described by text in the chart format."""
+
+    chart = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split('#')[0].strip()
+        if not line:
+            continue
+
+        try:
+            kind, total, actions = line.split()
+            total = int(total)
+        except ValueError:
+            raise ValueError(f'line {number} of the chart should look like "hard 16 SSSSSHHHHH"') from None
+
+        if kind not in ('hard', 'soft'):
+            raise ValueError(f'line {number} of the chart should start with "hard" or "soft"')
+        if len(actions) != len(UPCARDS) or set(actions) - {HIT, STAND}:
+            raise ValueError(f'line {number} of the chart should have {len(UPCARDS)} letters, each H or S')
+
+        chart[total, kind == 'soft'] = actions
+    return chart
+
+
+def format_chart(chart):
+    """Returns chart as text in the chart format."""
+
+    text = _HEADER
+    for total, soft in sorted(chart, key=lambda row: (row[1], row[0])):
+        kind = 'soft' if soft else 'hard'
+        text += f'{kind} {total:<5}{chart[total, soft]}\n'
+    return text
+
+
+def load_chart(path):
+    """Reads a chart from the file at path."""
+    with open(path) as file:
+        return parse_chart(file.read())
+
+
+def save_chart(chart, path):
+    """Writes chart to the file at path."""
+    with open(path, 'w') as file:
+        file.write(format_chart(chart))
+
+
+def hit_table(chart):
+    """Returns a table of the chart's decisions.
+
+    table[state][rank] is True if the chart hits a hand in state (see the tables module) against a
+    dealer upcard of rank (1 to 13). Looking up a decision is then two indexing operations.
+    """
+
+    columns = {upcard: column for column, upcard in enumerate(UPCARDS)}
+    table = []
+    for value, soft in zip(VALUES, SOFT):
+        actions = chart.get((value, soft), STAND * len(UPCARDS))
+        table.append((False,) + tuple(actions[columns[POINTS[rank]]] == HIT for rank in range(1, 14)))
+    return tuple(table)
+
+
+BASIC_STRATEGY = parse_chart('''
+#         23456789TA
+hard 4    HHHHHHHHHH
+hard 5    HHHHHHHHHH
+hard 6    HHHHHHHHHH
+hard 7    HHHHHHHHHH
+hard 8    HHHHHHHHHH
+hard 9    HHHHHHHHHH
+hard 10   HHHHHHHHHH
+hard 11   HHHHHHHHHH
+hard 12   HHSSSHHHHH
+hard 13   SSSSSHHHHH
+hard 14   SSSSSHHHHH
+hard 15   SSSSSHHHHH
+hard 16   SSSSSHHHHH
+hard 17   SSSSSSSSSS
+hard 18   SSSSSSSSSS
+hard 19   SSSSSSSSSS
+hard 20   SSSSSSSSSS
+hard 21   SSSSSSSSSS
+soft 12   HHHHHHHHHH
+soft 13   HHHHHHHHHH
+soft 14   HHHHHHHHHH
+soft 15   HHHHHHHHHH
+soft 16   HHHHHHHHHH
+soft 17   HHHHHHHHHH
+soft 18   SSSSSSSHHH
+soft 19   SSSSSSSSSS
+soft 20   SSSSSSSSSS
+soft 21   SSSSSSSSSS
+''')
@@ -0,0 +1,104 @@
+"""This module defines precomputed lookup tables for blackjack hands.
+
+Everything the rules of blackjack need to know about a hand fits in a small number of states:
+the hand's total with every Ace worth 1 point (the hard total), whether the hand holds an Ace,
+how many cards the hand holds (0, 1, 2, or 3 or more), and whether the first two cards are a pair.
+Each state is a small int, so adding a card to a hand is a single lookup:
+
+    state = TRANSITIONS[state][rank]
+
+The following tables are included in this module. Every table except TRANSITIONS is indexed by state.
+    TRANSITIONS : TRANSITIONS[state][rank] is the state after a card of rank (1 to 13) is added.
+    VALUES : The value of the hand as determined by the rules of blackjack.
+    HARD : The hard total of the hand.
+    SOFT : True if an Ace is being counted as 11 points.
+    PAIR : True if the hand is two cards worth the same number of points.
+    BLACKJACK : True if the hand is exactly two cards worth 21 points.
+    DEALER_HITS : True if a dealer who stands on all 17s hits the hand.
+
+The following are also included:
+    EMPTY : The state of a hand with no cards.
+    POINTS : POINTS[rank] is the number of points a card of rank is worth, with an Ace worth 1 point.
+    hand_state(ranks) : Returns the state of a hand holding cards of the given ranks.
+    describe(state) : Returns (hard, has_ace, n_cards, pair) for a state.
+    dealer_hits(hit_soft_17=False) : Builds a DEALER_HITS table for a dealer rule.
+
+Note
+----
+    A card is never added to a hand worth more than 21 points, so the largest hard total reached
+    in a game is 31. Hard totals are capped at 31, so 31 stands for "31 or more".
+"""
+
+MAX_HARD = 31
+
+# POINTS[0] is unused so the table can be indexed by rank.
+POINTS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+
+def _state(hard, has_ace, n_cards, pair):
+    return ((hard * 2 + has_ace) * 4 + n_cards) * 2 + pair
+
+
+def describe(state):
+    """Returns (hard, has_ace, n_cards, pair) for a state. n_cards is 3 for three or more cards."""
+    state, pair = divmod(state, 2)
+    state, n_cards = divmod(state, 4)
+    hard, has_ace = divmod(state, 2)
+    return hard, bool(has_ace), n_cards, bool(pair)
+
+
+def _value(hard, has_ace):
+    # At most one Ace can be worth 11 points without busting.
+    if has_ace and hard <= 11:
+        return hard + 10
+    return hard
+
+
+def _build():
+    transitions, values, hard_totals, soft, pairs, blackjack = [], [], [], [], [], []
+
+    for state in range(_state(MAX_HARD, 1, 3, 1) + 1):
+        hard, has_ace, n_cards, pair = describe(state)
+        value = _value(hard, has_ace)
+
+        values.append(value)
+        hard_totals.append(hard)
+        soft.append(value != hard)
+        pairs.append(pair)
+        blackjack.append(n_cards == 2 and value == 21)
+
+        row = [None]  # rank 0 is not a card
+        for rank in range(1, 14):
+            points = POINTS[rank]
+            row.append(_state(min(hard + points, MAX_HARD),
+                              has_ace or points == 1,
+                              min(n_cards + 1, 3),
+                              n_cards == 1 and hard == points))
+        transitions.append(tuple(row))
+
+    return tuple(transitions), tuple(values), tuple(hard_totals), tuple(soft), tuple(pairs), tuple(blackjack)
+
+
+TRANSITIONS, VALUES, HARD, SOFT, PAIR, BLACKJACK = _build()
+
+EMPTY = _state(0, 0, 0, 0)
+
+
+def hand_state(ranks):
+    """Returns the state of a hand holding cards of the given ranks."""
+    state = EMPTY
+    for rank in ranks:
+        state = TRANSITIONS[state][rank]
+    return state
+
+
+def dealer_hits(hit_soft_17=False):
+    """Returns a table that is True for every state a dealer hits.
+
+    The dealer hits anything worth less than 17 points. If hit_soft_17 is True, the dealer also hits a soft 17.
+    """
+    return tuple(value < 17 or (hit_soft_17 and value == 17 and is_soft)
+                 for value, is_soft in zip(VALUES, SOFT))
+
+
+DEALER_HITS = dealer_hits()
@@ -0,0 +1,525 @@
+"""This module plays huge batches of blackjack rounds at once using NumPy.
+
+NumPy is not needed for the rest of the package, so this module is not imported by the package.
+To use it, NumPy must be installed and the module imported directly:
+
+    from blackjack import vectorized
+    tally = vectorized.simulate(10_000_000, seed=1)
+
+Every round is one player against the dealer, dealt from a freshly shuffled shoe like a Game with
+a Deck. Cards and hands are stored as integer arrays, one row per round, and the hands are played
+with the lookup tables from the tables module. The dealer follows the table's rules like
+Dealer.decision() and the player follows a table built by hit_table(). Blackjacks and pushes are
+settled by the rules, but the player only hits and stands, so doubling, splitting, and surrender
+are never used.
+
+Long runs of rounds can also be kept as compact arrays of outcomes (one int8 per round, an index into
+OUTCOMES) with outcomes(), and then settled all at once with settle() or played out against a
+bankroll with trajectory(), for example to measure the risk of ruin of a betting plan.
+
+Agents that learn by playing can play many tables at once with the Environment class, which deals a
+round at every table and takes one action for each table at a time, like a vectorized gym environment.
+
+The following functions are included in this module:
+    hit_table
+    simulate
+    outcomes
+    settle
+    trajectory
+
+The following classes are included in this module:
+    Environment
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError('the vectorized module requires NumPy (pip install numpy)') from None
+
+from .results import (
+    LOSE,
+    BLACKJACK,
+    OUTCOMES,
+    outcome,
+    Tally)
+from .rules import Rules
+from .tables import (
+    TRANSITIONS,
+    VALUES,
+    SOFT,
+    BLACKJACK as BLACKJACKS,
+    POINTS,
+    DEALER_HITS,
+    MAX_HARD,
+    EMPTY)
+
+# Rank 0 is not a card, so its column of TRANSITIONS is filled with the empty state.
+_TRANSITIONS = np.array([(EMPTY,) + row[1:] for row in TRANSITIONS], dtype=np.intp)
+_VALUES = np.array(VALUES, dtype=np.intp)
+_SOFT = np.array(SOFT, dtype=np.intp)
+_POINTS = np.array(POINTS, dtype=np.intp)
+_DEALER_HITS = np.array(DEALER_HITS, dtype=bool)
+_BLACKJACK = np.array(BLACKJACKS, dtype=bool)
+
+
+def hit_table(decide):
+    """Builds a player strategy table from a function.
+
+    decide(value, is_soft, upcard) should return True if the player hits a hand worth value points
+    against the dealer's faceup card, where upcard is the number of points of that card (1 for an Ace).
+
+    Returns a bool array with a row for every state in the tables module and a column for every upcard
+    (column 0 is unused).
+    """
+    table = np.zeros((len(VALUES), 11), dtype=bool)
+    for state, (value, is_soft) in enumerate(zip(VALUES, SOFT)):
+        for upcard in range(1, 11):
+            table[state, upcard] = bool(decide(value, is_soft, upcard))
+    return table
+
+
+def _draw(shoes, positions, rows, rng):
+    """Draws the next card from the shoe of each round in rows.
+
+    Like Deck.draw(), each card is picked at random from the cards left in the shoe, which is
+    the same as shuffling the shoe first.
+    """
+    position = positions[rows]
+    swap = rng.integers(position, shoes.shape[1])
+    card = shoes[rows, swap]
+    shoes[rows, swap] = shoes[rows, position]
+    shoes[rows, position] = card
+    positions[rows] = position + 1
+    return card
+
+
+def _play(n_rounds, hits, dealer_hits, shoe, rng):
+    """Plays n_rounds rounds at once. Returns the player's hand states, the dealer's hand states,
+    the number of player hits, and the number of dealer hits, all as arrays."""
+
+    shoes = np.tile(shoe, (n_rounds, 1))
+    positions = np.zeros(n_rounds, dtype=np.intp)
+    every = np.arange(n_rounds)
+
+    # Cards are dealt in the same order as Game._deal(). The dealer's second card is the faceup card.
+    player = np.full(n_rounds, EMPTY, dtype=np.intp)
+    dealer = np.full(n_rounds, EMPTY, dtype=np.intp)
+    player = _TRANSITIONS[player, _draw(shoes, positions, every, rng)]
+    player = _TRANSITIONS[player, _draw(shoes, positions, every, rng)]
+    dealer = _TRANSITIONS[dealer, _draw(shoes, positions, every, rng)]
+    upcard = _draw(shoes, positions, every, rng)
+    dealer = _TRANSITIONS[dealer, upcard]
+    upcard = _POINTS[upcard]
+
+    # Nobody plays if the dealer has blackjack, and a player with blackjack doesn't play.
+    player_hits = np.zeros(n_rounds, dtype=np.intp)
+    playing = ~_BLACKJACK[player] & ~_BLACKJACK[dealer]
+    rows = every[playing & (_VALUES[player] <= 21) & hits[player, upcard]]
+    while rows.size:
+        player[rows] = _TRANSITIONS[player[rows], _draw(shoes, positions, rows, rng)]
+        player_hits[rows] += 1
+        rows = rows[(_VALUES[player[rows]] <= 21) & hits[player[rows], upcard[rows]]]
+
+    n_dealer_hits = np.zeros(n_rounds, dtype=np.intp)
+    rows = every[dealer_hits[dealer]]
+    while rows.size:
+        dealer[rows] = _TRANSITIONS[dealer[rows], _draw(shoes, positions, rows, rng)]
+        n_dealer_hits[rows] += 1
+        rows = rows[dealer_hits[dealer[rows]]]
+
+    return player, dealer, player_hits, n_dealer_hits
+
+
+def _outcome_table(rules):
+    """Returns table[player value, dealer value], the outcome (as an index into OUTCOMES) of a played out hand."""
+    return np.array([[OUTCOMES.index(outcome(value, dealer_value, rules.push)) for dealer_value in range(MAX_HARD + 1)]
+                     for value in range(MAX_HARD + 1)], dtype=np.intp)
+
+
+def _settle(player, dealer, table):
+    """Returns the outcome of each round (as an index into OUTCOMES) for the player and dealer hand states."""
+
+    outcomes = table[_VALUES[player], _VALUES[dealer]]
+
+    player_blackjack = _BLACKJACK[player]
+    dealer_blackjack = _BLACKJACK[dealer]
+    outcomes[player_blackjack & ~dealer_blackjack] = OUTCOMES.index(BLACKJACK)
+    outcomes[dealer_blackjack & ~player_blackjack] = OUTCOMES.index(LOSE)
+    return outcomes
+
+
+def _batches(n_rounds, hits, decks, seed, batch_size, rules):
+    """Plays n_rounds rounds in batches of at most batch_size. Yields the outcomes (as indices into OUTCOMES),
+    the number of player hits, and the number of dealer hits of each batch."""
+
+    if hits is None:
+        hits = np.repeat(_DEALER_HITS[:, None], 11, axis=1)
+    hits = np.asarray(hits, dtype=bool)
+    dealer_hits = np.array(rules.dealer_hits, dtype=bool)
+    table = _outcome_table(rules)
+
+    rng = np.random.default_rng(seed)
+    shoe = np.tile(np.arange(1, 14, dtype=np.int8), 4 * decks)
+
+    done = 0
+    while done < n_rounds:
+        batch = min(batch_size, n_rounds - done)
+        player, dealer, player_hits, n_dealer_hits = _play(batch, hits, dealer_hits, shoe, rng)
+        yield _settle(player, dealer, table), player_hits, n_dealer_hits
+        done += batch
+
+
+def _payoffs(rules):
+    """Returns an array of the number of bets won for each outcome, in the order of OUTCOMES."""
+    payoffs = rules.payoffs
+    return np.array([payoffs[key] for key in OUTCOMES])
+
+
+def simulate(n_rounds, hits=None, decks=1, seed=None, batch_size=100000, name='Player', rules=None):
+    """Plays n_rounds rounds of blackjack and returns a Tally of the outcomes.
+
+    Parameters
+    ----------
+        n_rounds : int
+            The number of rounds to play.
+
+        hits : array or None
+            The player's strategy, built by hit_table(). If None (the default), the player hits below 17
+            like the dealer.
+
+        decks : int
+            The number of decks in the shoe. Every round is dealt from a freshly shuffled shoe.
+
+        seed : int or None
+            Seeds the random number generator. The same seed always gives the same tally.
+
+        batch_size : int
+            The number of rounds played at once. Larger batches are faster but use more memory.
+
+        name : str
+            The name of the player in the tally.
+
+        rules : Rules or None
+            The rules of the table. If None (the default), Rules() is used. Only the dealer's rule,
+            the blackjack payout, and the push rule make a difference.
+    """
+
+    if rules is None:
+        rules = Rules()
+    payoffs = _payoffs(rules)
+    tally = Tally([name])
+
+    for batch, player_hits, n_dealer_hits in _batches(n_rounds, hits, decks, seed, batch_size, rules):
+        counts = np.bincount(batch, minlength=len(OUTCOMES))
+        for key, count in zip(OUTCOMES, counts):
+            tally.outcomes[0][key] += int(count)
+        tally.won[0] += float(payoffs[batch].sum())
+        tally.wagered[0] += len(batch)
+
+        tally.hits[0] += int(player_hits.sum())
+        tally.cards_drawn += 4 * len(batch) + int(player_hits.sum()) + int(n_dealer_hits.sum())
+        tally.rounds += len(batch)
+
+    return tally
+
+
+def outcomes(n_rounds, hits=None, decks=1, seed=None, batch_size=100000, rules=None):
+    """Plays n_rounds rounds of blackjack like simulate() and returns the outcome of every round.
+
+    The outcomes are an int8 array of indices into OUTCOMES (see the results module), so ten million
+    rounds only take ten megabytes. The parameters are the same as simulate(), and the same seed
+    plays the same rounds.
+    """
+
+    if rules is None:
+        rules = Rules()
+    result = np.empty(n_rounds, dtype=np.int8)
+    done = 0
+    for batch, _, _ in _batches(n_rounds, hits, decks, seed, batch_size, rules):
+        result[done:done + len(batch)] = batch
+        done += len(batch)
+    return result
+
+
+def settle(outcomes, bets=1, rules=None):
+    """Returns the amount won on every round, given the outcome of each round.
+
+    Parameters
+    ----------
+        outcomes : array
+            The outcome of every round, as indices into OUTCOMES (see outcomes()). Any shape works,
+            so many sessions can be settled at once.
+
+        bets : float or array
+            The amount bet on every round, or an array of bets with the same shape as outcomes.
+
+        rules : Rules or None
+            The rules the rounds are paid by. If None (the default), Rules() is used.
+    """
+
+    if rules is None:
+        rules = Rules()
+    return _payoffs(rules)[outcomes] * bets
+
+
+def trajectory(outcomes, bankroll, bets=1, rules=None):
+    """Returns the player's bankroll after every round, given the outcome of each round.
+
+    The last axis of outcomes is the order the rounds are played in, so a 2D array of outcomes is a
+    session in every row. Once a bankroll reaches zero the player is ruined and stops playing, so
+    the rest of that row stays where it was. The fraction of sessions that end at or below zero is
+    the risk of ruin.
+
+    Parameters
+    ----------
+        outcomes : array
+            The outcome of every round, as indices into OUTCOMES (see outcomes()).
+
+        bankroll : float
+            The money the player starts each session with.
+
+        bets : float or array
+            The amount bet on every round, or an array of bets with the same shape as outcomes.
+
+        rules : Rules or None
+            The rules the rounds are paid by. If None (the default), Rules() is used.
+    """
+
+    path = bankroll + np.cumsum(settle(outcomes, bets, rules), axis=-1)
+    ruined = np.logical_or.accumulate(path <= 0, axis=-1)
+    if ruined.any():
+        first = np.argmax(ruined, axis=-1)[..., None]
+        path = np.where(ruined, np.take_along_axis(path, first, axis=-1), path)
+    return path
+
+
+class Environment():
+    """Plays a round of blackjack at each of many tables at once, one action at a time, for training agents.
+
+    Every table is one player against the dealer, dealt from its own shoe. Like a vectorized gym
+    environment, step() takes one action for every table and returns the next observation of every table.
+    A round that ends is settled and a new round is dealt at that table straight away, so every table
+    always has a round waiting for an action.
+
+        Parameters
+        ----------
+            n_tables : int
+                The number of tables.
+
+            decks : int
+                The number of decks in each table's shoe. The default is 6.
+
+            penetration : float
+                The fraction of each shoe dealt before it is reshuffled, like Shoe. If 0, every round is dealt
+                from a freshly shuffled shoe, like simulate(). The default is 0.75. A shoe that runs out in the
+                middle of a round is reshuffled without the round's cards (see the notes).
+
+            seed : int or None
+                Seeds the random number generator. The same seed and the same actions always give the same
+                rounds, observations, and rewards.
+
+            rules : Rules or None
+                The rules of the tables. If None (the default), Rules() is used. Only the dealer's rule, the
+                blackjack payout, and the push rule make a difference.
+
+            tags : sequence or None
+                The tag of each rank for a card count, in the order Ace, 2, 3, ... King (for example
+                HI_LO_TAGS from the counting module). If None (the default), no count is kept.
+
+        Data Attributes
+        ---------------
+            n_tables : int
+                The number of tables.
+
+            states : array
+                The state of the player's hand at each table (see the tables module). A strategy table from
+                hit_table() can pick the actions: hits[env.states, env.upcards].
+
+            upcards : array
+                The number of points of the dealer's faceup card at each table (1 for an Ace).
+
+            counts : array or None
+                The running count of the cards seen at each table since its shoe was shuffled. The dealer's
+                facedown card is only counted once the round is over. None if there are no tags.
+
+            cards_left : array
+                The number of cards left in each table's shoe. counts / (cards_left / 52) is the true count.
+
+            rounds : int
+                The total number of rounds finished, added up over all the tables.
+
+        Methods
+        -------
+            reset(seed=None) :
+                Shuffles every shoe and deals a new round at every table, reseeding first if seed isn't None.
+                Returns the observations.
+
+            step(actions) :
+                Takes an action at every table: 1 (or True) to hit and 0 (or False) to stand.
+                Returns (observations, rewards, done, info)
+
+        Notes
+        -----
+            Observations :
+                An int array with a row for every table: the value of the player's hand, 1 if the hand is
+                soft (0 if not), the points of the dealer's faceup card, and the running count if there are
+                tags. When a round ends, the row is the first observation of the table's next round.
+
+            Rewards and Info :
+                rewards is the number of bets won at each table on this step (negative if lost), which is
+                only ever nonzero when the round ends. done is True for every table whose round ended, and
+                info['outcome'] has the outcome of each of those rounds as an index into OUTCOMES (-1 for
+                tables still playing). info['value'] has the final value of the player's hand.
+
+            Blackjacks :
+                A round where the player or the dealer has blackjack ends before the player can act, like
+                in a Game. It still takes one step, so every round is one episode with a reward at the end,
+                but the action for that step is ignored.
+
+            Running Out of Cards :
+                The cut card is only checked between rounds, so with a high penetration a shoe can run out in
+                the middle of a round. The cards dealt before the round are then reshuffled and dealing carries
+                on, like a dealer who runs out of cards. The cards of the round stay in play, and the table's
+                count starts again from 0.
+
+            The player only hits and stands, so doubling, splitting, and surrender are never used.
+    """
+
+    def __init__(self, n_tables, decks=6, penetration=0.75, seed=None, rules=None, tags=None):
+        if n_tables < 1:
+            raise ValueError('there must be at least one table')
+        if not 0 <= penetration <= 1:
+            raise ValueError('penetration must be between 0 and 1')
+        if tags is not None and len(tags) != 13:
+            raise ValueError('a count needs a tag for each of the 13 ranks')
+
+        if rules is None:
+            rules = Rules()
+        self.n_tables = n_tables
+        self._shoe = np.tile(np.arange(1, 14, dtype=np.int8), 4 * decks)
+        self._cut = int(len(self._shoe) * penetration)
+        self._tags = np.array((0,) + tuple(tags), dtype=np.intp) if tags is not None else None
+        self._dealer_hits = np.array(rules.dealer_hits, dtype=bool)
+        self._table = _outcome_table(rules)
+        self._payoffs = _payoffs(rules)
+        self._every = np.arange(n_tables)
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+
+    @property
+    def states(self):
+        return self._player
+
+    @property
+    def upcards(self):
+        return self._upcards
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def cards_left(self):
+        return self._shoes.shape[1] - self._positions
+
+    def reset(self, seed=None):
+        """Shuffles every shoe and deals a new round at every table. Returns the observations."""
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+
+        self._shoes = np.tile(self._shoe, (self.n_tables, 1))
+        self._positions = np.zeros(self.n_tables, dtype=np.intp)
+        self._starts = np.zeros(self.n_tables, dtype=np.intp)  # the position of the first card of each round
+        self._counts = np.zeros(self.n_tables, dtype=np.intp) if self._tags is not None else None
+        self._player = np.full(self.n_tables, EMPTY, dtype=np.intp)
+        self._dealer = np.full(self.n_tables, EMPTY, dtype=np.intp)
+        self._holes = np.zeros(self.n_tables, dtype=np.int8)
+        self._upcards = np.zeros(self.n_tables, dtype=np.intp)
+        self._naturals = np.zeros(self.n_tables, dtype=bool)
+        self.rounds = 0
+        self._deal(self._every)
+        return self._observe()
+
+    def _draw(self, rows, seen=True):
+        """Draws the next card at each table in rows, adding it to the count if seen is True."""
+        empty = rows[self._positions[rows] == self._shoes.shape[1]]
+        if empty.size:
+            self._collect(empty)
+        cards = _draw(self._shoes, self._positions, rows, self._rng)
+        if seen and self._tags is not None:
+            self._counts[rows] += self._tags[cards]
+        return cards
+
+    def _collect(self, rows):
+        """Reshuffles the cards dealt before the current round at each table in rows, whose shoes have run out."""
+        for row in rows:
+            start = self._starts[row]
+            if start == 0:
+                raise ValueError(f'a round at table {row} used every card in its shoe')
+            # The round's cards go to the front of the shoe, and _draw() picks from every card after them.
+            self._shoes[row] = np.roll(self._shoes[row], -start)
+            self._positions[row] -= start
+            self._starts[row] = 0
+        if self._tags is not None:
+            self._counts[rows] = 0
+
+    def _deal(self, rows):
+        """Deals a new round at each table in rows, in the same order as Game._deal(), reshuffling shoes
+        that have reached their cut card."""
+
+        shuffle = rows[self._positions[rows] >= self._cut]
+        self._positions[shuffle] = 0  # _draw() picks from every card after the position, so this reshuffles
+        if self._tags is not None:
+            self._counts[shuffle] = 0
+        self._starts[rows] = self._positions[rows]
+
+        player = _TRANSITIONS[EMPTY, self._draw(rows)]
+        self._player[rows] = _TRANSITIONS[player, self._draw(rows)]
+        self._holes[rows] = hole = self._draw(rows, seen=False)  # counted when the dealer turns it over
+        upcard = self._draw(rows)
+        self._dealer[rows] = _TRANSITIONS[_TRANSITIONS[EMPTY, hole], upcard]
+        self._upcards[rows] = _POINTS[upcard]
+        self._naturals[rows] = _BLACKJACK[self._player[rows]] | _BLACKJACK[self._dealer[rows]]
+
+    def _observe(self):
+        columns = [_VALUES[self._player], _SOFT[self._player], self._upcards]
+        if self._tags is not None:
+            columns.append(self._counts)
+        return np.stack(columns, axis=1)
+
+    def step(self, actions):
+        """Takes an action at every table: 1 (or True) to hit and 0 (or False) to stand.
+        Returns (observations, rewards, done, info). See the class docstring."""
+
+        actions = np.asarray(actions)
+        if actions.shape != (self.n_tables,):
+            raise ValueError(f'there must be one action for each of the {self.n_tables} tables, '
+                             f'not an array of shape {actions.shape}')
+        hit = actions.astype(bool)
+        if not np.array_equal(hit, actions):
+            raise ValueError('every action must be 1 (hit) or 0 (stand)')
+
+        hit &= ~self._naturals
+        rows = self._every[hit]
+        self._player[rows] = _TRANSITIONS[self._player[rows], self._draw(rows)]
+        done = ~hit | (_VALUES[self._player] > 21)
+
+        rows = self._every[done]
+        outcomes = np.full(self.n_tables, -1, dtype=np.intp)
+        rewards = np.zeros(self.n_tables)
+        values = _VALUES[self._player]
+        if rows.size:
+            # The dealer turns over the facedown card and plays out every finished round, like in a Game.
+            if self._tags is not None:
+                self._counts[rows] += self._tags[self._holes[rows]]
+            playing = rows[self._dealer_hits[self._dealer[rows]]]
+            while playing.size:
+                self._dealer[playing] = _TRANSITIONS[self._dealer[playing], self._draw(playing)]
+                playing = playing[self._dealer_hits[self._dealer[playing]]]
+
+            outcomes[rows] = _settle(self._player[rows], self._dealer[rows], self._table)
+            rewards[rows] = self._payoffs[outcomes[rows]]
+            self.rounds += rows.size
+            self._deal(rows)
+
+        return self._observe(), rewards, done, {'outcome': outcomes, 'value': values}
@@ -0,0 +1,118 @@
+"""Tests for the cards module."""
+
+import copy
+import pickle
+
+import pytest
+
+from blackjack import (
+    Deck,
+    Shoe,
+    ShuffleSource,
+    HiLo)
+from blackjack.cards import ReplayDeck
+
+
+def test_shuffle_keeps_the_cards_already_drawn():
+    shoe = Shoe(1, rng=1)
+    drawn = [shoe.draw() for _ in range(10)]
+    shoe.shuffle()
+    assert len(shoe) == 42
+    assert shoe.drawn == 10
+    assert shoe.drawn_cards() == drawn
+    assert sum(shoe.ranks) == 42
+
+    shoe.reshuffle()
+    assert len(shoe) == 52
+    assert shoe.cut_card == 39
+    assert shoe.ranks == Deck().ranks
+
+
+def test_shuffle_only_reorders_the_cards_left():
+    deck = Deck(rng=2)
+    for _ in range(5):
+        deck.draw()
+    left = sorted(id(card) for card in deck)
+    deck.shuffle()
+    assert sorted(id(card) for card in deck) == left
+
+
+def test_adding_shoes_makes_a_deck():
+    shoe = Shoe(2, rng=1)
+    for _ in range(4):
+        shoe.draw()
+    deck = shoe + Shoe(1, rng=2)
+    assert type(deck) is Deck
+    assert len(deck) == 100 + 52
+
+
+def test_adding_replay_decks_makes_a_deck():
+    dealt = Deck(rng=1)
+    cards = [dealt.draw() for _ in range(3)]
+    replay = ReplayDeck([cards], rng=1)
+    replay.reshuffle()
+    replay.draw()
+    deck = replay + ReplayDeck([cards], rng=2)
+    assert type(deck) is Deck
+    assert len(deck) == 51 + 52
+
+
+def test_adding_different_kinds_of_deck_raises():
+    with pytest.raises(TypeError):
+        Shoe(1) + Deck()
+
+
+def test_a_round_that_runs_out_is_finished_with_the_discards():
+    shoe = Shoe(1, rng=3)
+    earlier = [shoe.draw() for _ in range(40)]
+    shoe.start_round()
+    current = [shoe.draw() for _ in range(12)]
+    assert len(shoe) == 0
+
+    card = shoe.draw()
+    assert shoe.drawn_cards() == current + [card]
+    assert card in earlier
+    assert len(shoe) == 39
+    assert sum(shoe.ranks) == 39
+
+
+def test_a_deck_with_no_discards_still_runs_out():
+    deck = Deck(rng=3)
+    deck.start_round()
+    for _ in range(52):
+        deck.draw()
+    with pytest.raises(IndexError):
+        deck.draw()
+
+
+@pytest.mark.parametrize('copier', [lambda shoe: pickle.loads(pickle.dumps(shoe)), copy.deepcopy])
+def test_a_copied_shuffle_source_deals_the_same_cards(copier):
+    shoe = Shoe(1, rng=ShuffleSource(3, batch_size=4))
+    for _ in range(3):
+        shoe.reshuffle()
+    other = copier(shoe)
+    assert other.rng._batch_size == 4
+
+    for _ in range(6):
+        shoe.reshuffle()
+        other.reshuffle()
+        assert [shoe.draw() for _ in range(20)] == [other.draw() for _ in range(20)]
+
+
+def test_a_shallow_copy_of_a_shuffle_source_is_independent():
+    source = ShuffleSource(5, batch_size=2)
+    source.permutation(10)
+    other = copy.copy(source)
+    assert [source.permutation(10) for _ in range(5)] == [other.permutation(10) for _ in range(5)]
+
+
+def test_draw_many_draws_the_same_cards_as_draw():
+    counter, other_counter = HiLo(), HiLo()
+    deck, other = Deck(rng=6, counter=counter), Deck(rng=6, counter=other_counter)
+    for n in (4, 1, 7, 30, 12):  # the last one runs past the end of the deck
+        if n > len(deck):
+            deck.start_round()
+            other.start_round()
+        assert [id(card) for card in deck.draw_many(n)] == [id(other.draw()) for _ in range(n)]
+        assert deck.ranks == other.ranks
+        assert counter.running == other_counter.running
@@ -0,0 +1,110 @@
+"""Tests for the counting module."""
+
+import pytest
+
+from blackjack import (
+    Game,
+    Deck,
+    Shoe,
+    Player,
+    HiLo,
+    KO)
+from blackjack.counting import HI_LO_TAGS
+
+
+def _count(cards):
+    """Returns the Hi-Lo count of cards, facedown or not."""
+    values = (card.flip().value if card.is_hidden else card.value for card in cards)
+    return sum(HI_LO_TAGS[value - 1] for value in values)
+
+
+def test_running_count():
+    counter = HiLo()
+    deck = Deck(rng=1, counter=counter)
+    drawn = [deck.draw() for _ in range(30)]
+    assert counter.running == _count(drawn)
+
+    deck.reshuffle()
+    assert counter.running == 0
+    for _ in range(52):
+        deck.draw()
+    assert counter.running == 0  # Hi-Lo is balanced
+
+
+def test_facedown_cards_are_counted():
+    counter = HiLo()
+    deck = Deck(rng=1, counter=counter)
+    deck.hide()
+    drawn = [deck.draw() for _ in range(10)]
+    assert all(card.is_hidden for card in drawn)
+    assert counter.running == _count(drawn)
+
+
+def test_true_count():
+    counter = HiLo()
+    shoe = Shoe(2, penetration=1.0, rng=2, counter=counter)
+    assert counter.true_count == 0
+    for _ in range(52):
+        shoe.draw()
+    assert counter.decks_left == 1
+    assert counter.true_count == counter.running
+    for _ in range(26):
+        shoe.draw()
+    assert counter.true_count == pytest.approx(counter.running * 2)
+
+
+def test_ko_starts_below_zero_for_every_deck():
+    counter = KO()
+    shoe = Shoe(6, counter=counter)
+    assert counter.running == -20
+    for _ in range(100):
+        shoe.draw()
+    shoe.reshuffle()
+    assert counter.running == -20
+
+    Deck(counter=counter)
+    assert counter.running == 0
+    assert shoe.counter is None
+
+
+class HoleWatcher(Player):
+    """Hits below 17 and checks at every decision that the dealer's facedown card isn't in the count."""
+
+    def __init__(self, name, game=None):
+        super().__init__(name)
+        self.game = game
+        self.decisions = 0
+
+    def decision(self):
+        deck = self.game._deck
+        hole = self.game._dealer.hand[0]
+        assert hole.is_hidden
+        assert self.counter.running == _count(deck.drawn_cards()) - _count([hole])
+        self.decisions += 1
+        return self.hand.value < 17
+
+
+def _watched_game():
+    player = HoleWatcher('W')
+    game = Game(player, summary=False, deck=Deck(rng=3, counter=HiLo()))
+    player.game = game
+    return game, player
+
+
+def test_the_hole_card_is_counted_on_the_dealers_turn():
+    game, player = _watched_game()
+    counter = game._deck.counter
+    for _ in range(500):
+        game()
+        # The dealer has turned the card over, so every card drawn is counted.
+        assert counter.running == _count(game._deck.drawn_cards())
+    assert player.decisions > 300
+
+
+def test_simulate_counts_the_hole_card_on_the_dealers_turn():
+    game, player = _watched_game()
+    counter = game._deck.counter
+    for _ in range(500):
+        game.simulate(1)
+        assert counter.running == _count(game._deck.drawn_cards())
+    assert player.decisions > 300
@@ -0,0 +1,103 @@
+"""Tests for the Game class."""
+
+from blackjack import (
+    Game,
+    Deck,
+    Shoe,
+    Player,
+    StrategyPlayer,
+    HiLo)
+
+
+class Peeker(Player):
+    """Hits below 17 and records whether the dealer's first card was facedown at every decision."""
+
+    def __init__(self, name, game=None):
+        super().__init__(name)
+        self.game = game
+        self.hidden = []
+        self.unseen_cards = []
+
+    def decision(self):
+        dealer_hand = self.game._dealer.hand
+        self.hidden.append((dealer_hand[0].is_hidden, dealer_hand[1].is_hidden))
+        self.unseen_cards.append(self.unseen)
+        return self.hand.value < 17
+
+
+def _peeker_game():
+    player = Peeker('P')
+    game = Game(player, summary=False, deck=Deck(rng=1))
+    player.game = game
+    return game, player
+
+
+def test_simulate_keeps_the_hole_card_facedown():
+    game, player = _peeker_game()
+    game.simulate(2000)
+    assert player.hidden and all(hidden == (True, False) for hidden in player.hidden)
+
+
+def test_simulate_matches_playing_rounds():
+    game, player = _peeker_game()
+    tally = game.simulate(2000)
+    other, other_player = _peeker_game()
+    outcomes = [other() for _ in range(2000)]
+    assert tally.cards_drawn == sum(result.cards_drawn for result in outcomes)
+    assert player.hidden == other_player.hidden
+    assert player.unseen_cards == other_player.unseen_cards
+
+
+
+class Watcher(Player):
+    """Hits below 17 and checks at every decision that unseen is every card it hasn't been shown."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.decisions = 0
+
+    def decision(self):
+        expected = list(Deck().ranks)
+        for card in list(self.hand) + [self.upcard]:
+            expected[card.value] -= 1
+        assert self.unseen == tuple(expected)
+        self.decisions += 1
+        return self.hand.value < 17
+
+
+def test_unseen_cards_are_the_deck_and_the_hole_card():
+    player = Watcher('W')
+    game = Game(player, summary=False, deck=Deck(rng=4))
+    for _ in range(200):
+        game()
+    game.simulate(200)
+    assert player.decisions > 300
+
+
+def _check_shoe(shoe, decks):
+    """Checks that no card was lost or doubled while the shoe was dealt."""
+    shoe.reshuffle()
+    assert len(shoe) == 52 * decks
+    assert shoe.ranks == Shoe(decks).ranks
+    assert sorted(id(card) for card in shoe) == sorted(id(card) for card in Shoe(decks))
+
+
+def test_several_players_can_finish_a_round_past_the_end_of_a_shoe():
+    players = [StrategyPlayer(f'P{seat}') for seat in range(3)]
+    shoe = Shoe(1, penetration=1.0, rng=0, counter=HiLo())
+    game = Game(*players, summary=False, deck=shoe)
+    tally = game.simulate(5000)
+    assert tally.rounds == 5000
+    _check_shoe(shoe, 1)
+
+    for _ in range(1000):
+        game()
+    _check_shoe(shoe, 1)
+
+
+def test_two_players_on_a_deep_shoe():
+    players = [StrategyPlayer('A'), StrategyPlayer('B')]
+    shoe = Shoe(1, penetration=0.9, rng=0)
+    game = Game(*players, summary=False, deck=shoe)
+    assert game.simulate(5000).rounds == 5000
+    _check_shoe(shoe, 1)
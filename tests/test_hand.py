@@ -0,0 +1,48 @@
+"""Tests for the table-driven Hand against the way hands were valued before the lookup tables."""
+
+from itertools import product
+
+from blackjack import (
+    Card,
+    Hand)
+from blackjack.tables import MAX_HARD
+
+CARDS = [None] + [Card(rank, 'Spades') for rank in range(1, 14)]
+
+
+def _old_value(ranks):
+    """Returns (value, is_soft) the way Hand._update_value() worked them out, from every card in the hand."""
+    value_list = [rank if rank <= 10 else 10 for rank in ranks]
+    hand_value = sum(value_list)
+    while value_list.count(1) > 0 and (21 - hand_value) >= 10:
+        value_list[value_list.index(1)] = 11
+        hand_value = sum(value_list)
+    return hand_value, 11 in value_list
+
+
+def test_every_hand_of_one_to_five_cards():
+    for n_cards in range(1, 6):
+        for ranks in product(range(1, 14), repeat=n_cards):
+            hand = Hand()
+            for rank in ranks:
+                hand.add(CARDS[rank])
+            value, is_soft = _old_value(ranks)
+            # Hard totals are capped at MAX_HARD, which is always a bust.
+            assert (hand.value, hand.is_soft) == (min(value, MAX_HARD), is_soft), ranks
+            assert hand.is_bust == (value > 21), ranks
+
+
+def test_hard_totals_are_capped():
+    hand = Hand()
+    hand.add([Card(13, 'Spades')] * 4)
+    assert hand.value == MAX_HARD == 31
+    assert hand.is_bust
+
+
+def test_drawing_from_a_hand_with_a_facedown_card():
+    hand = Hand()
+    hand.add([CARDS[10], CARDS[6], CARDS[1]])
+    hand.flip(1)
+    assert hand.draw() is CARDS[10]
+    assert (hand.value, hand.is_soft) == (17, True)
+    assert hand[0].is_hidden
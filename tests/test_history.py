@@ -0,0 +1,125 @@
+"""Tests for the history module."""
+
+import pytest
+
+from blackjack import (
+    Game,
+    Deck,
+    Shoe,
+    Player,
+    StrategyPlayer,
+    HistoryWriter,
+    HistoryReader,
+    Rules)
+from blackjack.cards import ReplayDeck
+from blackjack.history import (
+    decode_cards,
+    replay)
+
+
+def _game(history=None):
+    players = [StrategyPlayer('A'), StrategyPlayer('B')]
+    return Game(*players, summary=False, deck=Shoe(2, rng=1), history=history)
+
+
+def test_rounds_read_back_the_way_they_were_played(tmp_path):
+    path = tmp_path / 'rounds.bjh'
+    with HistoryWriter(path, seed=1) as history:
+        game = _game(history)
+        results = [game() for _ in range(300)]
+
+    with HistoryReader(path) as reader:
+        records = list(reader)
+        assert len(reader) == len(records) == 300
+        assert reader.seed == 1
+        assert [len(cards) for cards in reader.cards()] == [result.cards_drawn for result in results]
+
+    for record, result in zip(records, results):
+        assert record.dealer_value == result.dealer_value
+        assert len(decode_cards(record.cards)) == result.cards_drawn
+        assert [(hand.seat, hand.outcome, hand.payoff, hand.wager) for hand in record.hands] == \
+            [(hand.seat, hand.outcome, hand.payoff, hand.wager) for hand in result.players]
+        assert record.seed == 1
+
+
+def test_every_seed_is_recorded(tmp_path):
+    path = tmp_path / 'rounds.bjh'
+    with HistoryWriter(path) as history:
+        game = _game(history)
+        game.simulate(2)
+        game.seed(5)
+        game.simulate(3)
+        game.seed(None)
+        game.simulate(2)
+        with pytest.raises(ValueError):
+            game.seed('not an int')
+
+    with HistoryReader(path) as reader:
+        records = list(reader)
+    assert [record.seed for record in records] == [None, None, 5, 5, 5, None, None]
+
+    # The seed deals the recorded cards again.
+    with HistoryWriter(tmp_path / 'again.bjh') as history:
+        game = _game(history)
+        game.seed(5)
+        game.simulate(3)
+    with HistoryReader(tmp_path / 'again.bjh') as reader:
+        assert list(reader.cards()) == [record.cards for record in records[2:5]]
+
+
+def test_a_cut_off_round_is_skipped(tmp_path):
+    path = tmp_path / 'rounds.bjh'
+    with HistoryWriter(path) as history:
+        _game(history).simulate(10)
+    with open(path, 'r+b') as file:
+        file.truncate(file.seek(0, 2) - 3)
+    with HistoryReader(path) as reader:
+        assert len(reader) == len(list(reader)) == 9
+
+
+def _totals(tally):
+    return tally.rounds, tally.outcomes, tally.won, tally.wagered, tally.cards_drawn
+
+
+def test_replaying_gives_the_recorded_tally(tmp_path):
+    path = tmp_path / 'rounds.bjh'
+    rules = Rules(surrender=True)
+    with HistoryWriter(path) as history:
+        players = [StrategyPlayer('A'), StrategyPlayer('B', bet=2)]
+        game = Game(*players, summary=False, deck=Shoe(6, rng=2), rules=rules, history=history)
+        tally = game.simulate(3000)
+
+    assert _totals(replay(path, rules=rules, decks=6)) == _totals(tally)
+
+
+class Stander(Player):
+    def decision(self):
+        return False
+
+
+class Hitter(Player):
+    def decision(self):
+        return self.hand.value < 20
+
+
+def test_a_new_player_can_draw_past_the_recorded_cards(tmp_path):
+    path = tmp_path / 'rounds.bjh'
+    with HistoryWriter(path) as history:
+        Game(Stander('S'), summary=False, deck=Deck(rng=3), history=history).simulate(500)
+
+    again = tmp_path / 'again.bjh'
+    with HistoryReader(path) as reader, HistoryWriter(again) as history:
+        deck = ReplayDeck((decode_cards(cards) for cards in reader.cards()), rng=4)
+        tally = Game(Hitter('H'), summary=False, deck=deck, history=history).simulate(500)
+        recorded = list(reader.cards())
+    assert tally.rounds == 500
+    assert _totals(replay(path, Hitter('H'), rng=4)) == _totals(tally)
+
+    with HistoryReader(again) as reader:
+        played = list(reader.cards())
+    assert any(len(new) > len(old) for old, new in zip(recorded, played))
+    for old, new in zip(recorded, played):
+        # The recorded cards are dealt first, in order, however many of them the round uses.
+        shared = min(len(old), len(new))
+        assert new[:shared] == old[:shared]
+        assert len(set(new)) == len(new)  # no card is dealt twice from the one deck
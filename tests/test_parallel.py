@@ -0,0 +1,40 @@
+"""Tests for the parallel module."""
+
+from blackjack import (
+    Game,
+    Deck,
+    Shoe,
+    ShuffleSource,
+    StrategyPlayer,
+    parallel)
+
+
+def _tally(tally):
+    return tally.outcomes, tally.won, tally.cards_drawn
+
+
+def _check_same_seed(deck):
+    game = Game(StrategyPlayer('A'), summary=False, deck=deck)
+    first = parallel.simulate(game, 2000, workers=2, seed=5)
+    game.simulate(7)  # the parent deals part of a shoe between the two runs
+    second = parallel.simulate(game, 2000, workers=2, seed=5)
+    assert _tally(first) == _tally(second)
+
+
+def test_same_seed_same_tally_with_a_deck():
+    _check_same_seed(Deck(rng=1))
+
+
+def test_same_seed_same_tally_with_a_shoe():
+    _check_same_seed(Shoe(rng=1))
+
+
+def test_same_seed_same_tally_with_a_shuffle_source():
+    _check_same_seed(Shoe(rng=ShuffleSource(1)))
+
+
+def test_workers_deal_different_shoes():
+    game = Game(StrategyPlayer('A'), summary=False, deck=Shoe(rng=ShuffleSource(1)))
+    first = parallel.simulate(game, 30, workers=1, seed=5)
+    second = parallel.simulate(game, 30, workers=1, seed=6)
+    assert _tally(first) != _tally(second)
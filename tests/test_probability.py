@@ -0,0 +1,38 @@
+"""Tests for the probability module."""
+
+import pytest
+
+from blackjack import probability
+from blackjack.rules import Rules
+from blackjack.tables import hand_state
+
+# One Ace and three 10s. Against a 10 the dealer's hidden card can't be the Ace, so the dealer has 20.
+ACE_AND_TENS = (1, 0, 0, 0, 0, 0, 0, 0, 0, 3)
+
+
+def test_evs_are_given_that_the_dealer_doesnt_have_blackjack():
+    assert probability.blackjack_probability(10, ACE_AND_TENS) == 0.25
+    assert probability.stand_ev(hand_state((10, 1, 10)), 10, ACE_AND_TENS) == 1.0
+    assert probability.stand_ev(hand_state((10, 9)), 10, ACE_AND_TENS) == -1.0
+
+
+def test_evs_follow_the_push_rule():
+    state = hand_state((10, 10))
+    assert probability.stand_ev(state, 10, ACE_AND_TENS) == 0.0
+    assert probability.stand_ev(state, 10, ACE_AND_TENS, Rules(push=False)) == 1.0
+
+
+def test_a_certain_dealer_blackjack_has_no_ev():
+    with pytest.raises(ValueError):
+        probability.stand_ev(hand_state((10, 9)), 10, (2, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+
+
+def test_upcards_can_be_ranks():
+    shoe = probability.shoe_composition(6)
+    state = hand_state((10, 6))
+    for rank in (11, 12, 13):
+        assert probability.stand_ev(state, rank, shoe) == probability.stand_ev(state, 10, shoe)
+        assert probability.blackjack_probability(rank, shoe) == probability.blackjack_probability(10, shoe)
+    for upcard in (0, 14, 10.0):
+        with pytest.raises(ValueError):
+            probability.stand_ev(state, upcard, shoe)
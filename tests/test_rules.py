@@ -0,0 +1,122 @@
+"""Tests for the table rules, played out on rigged decks.
+
+A ReplayDeck deals a recorded round in order, so each test lays out the cards: two for every player,
+then the dealer's facedown card and upcard, then the cards drawn during the round.
+"""
+
+import pytest
+
+from blackjack import (
+    Card,
+    Game,
+    Player,
+    ReplayDeck,
+    Rules)
+from blackjack.results import (
+    WIN,
+    LOSE,
+    PUSH,
+    BLACKJACK,
+    SURRENDER as SURRENDERED)
+from blackjack.rules import (
+    STAND,
+    DOUBLE,
+    SPLIT,
+    SURRENDER)
+
+SUITS = ('Spades', 'Hearts', 'Diamonds', 'Clubs')
+
+
+def _cards(*ranks):
+    """Returns a card for each rank, going through the suits so no card is used twice."""
+    return [Card(rank, SUITS[index % 4]) for index, rank in enumerate(ranks)]
+
+
+class Scripted(Player):
+    """Takes the actions it is given, in order. Fails the test if it is asked for more."""
+
+    def __init__(self, name, *actions, bet=1):
+        super().__init__(name, bet=bet)
+        self.actions = list(actions)
+
+    def decision(self):
+        assert self.actions, f'{self.name} was asked for a decision it had no action for'
+        return self.actions.pop(0)
+
+
+def _play(player, ranks, **rules):
+    """Plays one round of player against a deck rigged with ranks. Returns the RoundResult."""
+    game = Game(player, summary=False, deck=ReplayDeck([_cards(*ranks)]), rules=Rules(**rules))
+    result = game()
+    assert not player.actions
+    return result
+
+
+def _hands(result):
+    """Returns (value, outcome, payoff, wager) for every hand in result."""
+    return [(hand.value, hand.outcome, hand.payoff, hand.wager) for hand in result.players]
+
+
+def test_split_and_double_after_split():
+    # 8, 8 against a dealer 17. The first hand gets a 3 and doubles onto 21, the second gets a 10.
+    player = Scripted('P', SPLIT, DOUBLE, STAND)
+    result = _play(player, (8, 8, 10, 7, 3, 10, 10))
+    assert _hands(result) == [(21, WIN, 2.0, 2), (18, WIN, 1.0, 1)]
+    assert result.cards_drawn == 7
+    assert player.bankroll == 3.0
+
+
+def test_no_double_after_split():
+    player = Scripted('P', SPLIT, DOUBLE)
+    with pytest.raises(ValueError):
+        _play(player, (8, 8, 10, 7, 3, 10, 10), double_after_split=False)
+
+
+def test_resplit_aces():
+    # The first split Ace is dealt another Ace and splits again. Every split Ace gets one card.
+    player = Scripted('P', SPLIT, SPLIT)
+    result = _play(player, (1, 1, 10, 7, 1, 9, 5, 8), resplit_aces=True)
+    assert _hands(result) == [(16, LOSE, -1.0, 1), (19, WIN, 1.0, 1), (20, WIN, 1.0, 1)]
+    assert player.bankroll == 1.0
+
+
+def test_split_aces_are_not_resplit_by_default():
+    # The Ace dealt to the first split Ace stays, and the player isn't asked about either hand.
+    player = Scripted('P', SPLIT)
+    result = _play(player, (1, 1, 10, 7, 1, 9))
+    assert _hands(result) == [(12, LOSE, -1.0, 1), (20, WIN, 1.0, 1)]
+
+
+def test_surrender():
+    player = Scripted('P', SURRENDER, bet=2)
+    result = _play(player, (10, 6, 10, 9), surrender=True)
+    assert _hands(result) == [(16, SURRENDERED, -1.0, 2)]
+    assert player.bankroll == -1.0
+
+    with pytest.raises(ValueError):
+        _play(Scripted('P', SURRENDER), (10, 6, 10, 9))
+
+
+def test_the_dealer_peeks_for_blackjack():
+    # The dealer has an Ace under a 10, so no one is asked for a decision.
+    result = _play(Scripted('P'), (10, 9, 1, 10))
+    assert _hands(result) == [(19, LOSE, -1.0, 1)]
+    assert result.dealer_value == 21
+    assert result.cards_drawn == 4
+
+    result = _play(Scripted('P'), (1, 13, 1, 10))
+    assert _hands(result) == [(21, PUSH, 0.0, 1)]
+
+
+@pytest.mark.parametrize('blackjack_pays, won', [(1.5, 3.0), (1.2, 2.4)])
+def test_blackjack_payouts(blackjack_pays, won):
+    player = Scripted('P', bet=2)
+    result = _play(player, (1, 13, 10, 7), blackjack_pays=blackjack_pays)
+    assert _hands(result) == [(21, BLACKJACK, won, 2)]
+    assert player.bankroll == won
+
+
+@pytest.mark.parametrize('push, outcome, won', [(True, PUSH, 0.0), (False, WIN, 1.0)])
+def test_ties(push, outcome, won):
+    result = _play(Scripted('P', STAND), (10, 8, 10, 8), push=push)
+    assert _hands(result) == [(18, outcome, won, 1)]
@@ -0,0 +1,63 @@
+"""Tests for the vectorized module. Skipped when NumPy isn't installed."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from blackjack import (  # noqa: E402
+    Game,
+    Deck,
+    Player)
+from blackjack.results import (  # noqa: E402
+    WIN,
+    LOSE,
+    BUST,
+    PUSH,
+    BLACKJACK)
+from blackjack import vectorized  # noqa: E402
+
+N_ROUNDS = 100000
+
+# At this many rounds each rate has a standard deviation of at most 0.0016, so the difference between
+# the two simulations has one of at most 0.0023, and 0.01 is more than four standard deviations.
+TOLERANCE = 0.01
+
+
+class DealerLikePlayer(Player):
+    """Hits below 17, the strategy vectorized.simulate() uses when it isn't given one."""
+
+    def decision(self):
+        return self.hand.value < 17
+
+
+def _rates(tally):
+    outcomes = tally.outcomes[0]
+    return {
+        'win': (outcomes[WIN] + outcomes[BLACKJACK]) / tally.rounds,
+        'push': outcomes[PUSH] / tally.rounds,
+        'loss': (outcomes[LOSE] + outcomes[BUST]) / tally.rounds,
+    }
+
+
+def test_simulate_matches_game():
+    scalar = Game(DealerLikePlayer('Player'), summary=False, deck=Deck(rng=1)).simulate(N_ROUNDS)
+    vector = vectorized.simulate(N_ROUNDS, decks=1, seed=1)
+    assert vector.rounds == scalar.rounds == N_ROUNDS
+
+    scalar_rates, vector_rates = _rates(scalar), _rates(vector)
+    for key in scalar_rates:
+        assert abs(scalar_rates[key] - vector_rates[key]) < TOLERANCE, key
+
+
+def test_environment_carries_on_when_a_shoe_runs_out():
+    from blackjack.counting import HI_LO_TAGS
+
+    env = vectorized.Environment(64, decks=1, penetration=1.0, seed=3, tags=HI_LO_TAGS)
+    hits = vectorized.hit_table(lambda value, is_soft, upcard: value < 17)
+    for _ in range(2000):
+        env.step(hits[env.states, env.upcards])
+    assert env.rounds > 10000
+
+    # Every shoe still holds exactly one deck's cards.
+    full = np.sort(np.tile(np.arange(1, 14), 4))
+    assert (np.sort(env._shoes, axis=1) == full).all()